@@ -0,0 +1,44 @@
+import asyncio
+import inspect
+
+
+def is_async_class(cls):
+    """
+    Checks whether a class defines coroutine methods (`async def`).
+    """
+    return any(
+        inspect.iscoroutinefunction(getattr(cls, m, None))
+        for m in dir(cls)
+        if not m.startswith("__")
+    )
+
+
+async def await_with_timeout(result, timeout):
+    """
+    Awaits the result of a method call if it is awaitable, failing with
+    `asyncio.TimeoutError` when it does not complete within `timeout` seconds.
+    """
+    if inspect.isawaitable(result):
+        return await asyncio.wait_for(result, timeout)
+    return result
+
+
+def run_awaitable(result, timeout):
+    """
+    Drives an awaitable returned by a synchronous call site to completion on a fresh event loop.
+    """
+    return asyncio.run(await_with_timeout(result, timeout))
+
+
+def run_concurrently(coroutines, sequential=False):
+    """
+    Runs independent coroutines as tasks on one event loop and waits for all of them.
+    With `sequential`, each coroutine finishes before the next one starts, so per-call
+    measurements (wall time, tracemalloc peak) are not shared with other tasks.
+    """
+    async def gather():
+        if sequential:
+            return [await coroutine for coroutine in coroutines]
+        return await asyncio.gather(*coroutines)
+
+    return asyncio.run(gather())
@@ -0,0 +1,118 @@
+import json
+import os
+import queue
+import tempfile
+import threading
+from pathlib import Path
+
+from .replay import render_sequence, write_job, start_worker
+
+
+def differences(old, new):
+    """
+    Positions of the calls whose outcome differs between two replays. A replay that ends
+    early (its sequence raised) differs from one that goes on at the first call it did
+    not reach; the calls after that one ran in one version only and are not reported.
+    """
+    for position in range(max(len(old), len(new))):
+        old_outcome = old[position] if position < len(old) else None
+        new_outcome = new[position] if position < len(new) else None
+        if old_outcome != new_outcome:
+            yield position
+        if old_outcome is None or new_outcome is None:
+            return
+
+
+def describe_outcome(outcome):
+    """
+    Renders a replay outcome for the report.
+    """
+    if outcome is None:
+        return "not reached"
+    kind, name, detail = (list(outcome) + [None])[:3]
+    if kind == "raise":
+        return f"raises {name}: {detail}"
+    if kind == "value":
+        return detail
+    return f"<{name}>"
+
+
+def stream_outcomes(job_path, version, results):
+    """
+    Runs one worker and forwards (version, index, outcomes) messages as they arrive,
+    followed by (version, None, exit status).
+    """
+    worker = start_worker(job_path)
+    for line in worker.stdout:
+        message = json.loads(line)
+        results.put((version, message["index"], message["outcomes"]))
+    results.put((version, None, worker.wait()))
+
+
+def diff_versions(tot_sequences, old_files, new_files, async_methods=None, workers=None):
+    """
+    Replays one corpus against two versions of the target files at the same time and
+    yields the sequences whose observable behavior differs, as soon as both replays are in.
+
+    Each version is loaded only in its own worker processes, so both can define the same
+    module names. The corpus is split into one chunk per worker and version.
+
+    Args:
+        tot_sequences (list): List of test sequences.
+        old_files (list): Target files of the old version, in load order.
+        new_files (list): Target files of the new version, in load order.
+        async_methods (set): (class, method) pairs that are coroutines.
+        workers (int): Number of worker processes per version (default: half the CPU count).
+
+    Yields:
+        tuple: (sequence index, call position, old outcome, new outcome) for every call
+               whose outcome differs between the replays. Sequences that a version could
+               not replay at all are yielded once, with position None.
+
+    Raises:
+        RuntimeError: If neither version could replay some sequences.
+    """
+    async_methods = async_methods or set()
+    entries = [render_sequence(sequence, async_methods) for sequence in tot_sequences]
+    if not entries:
+        return
+    workers = max(1, min(len(entries), workers or (os.cpu_count() or 2) // 2))
+    chunk_size = -(-len(entries) // workers)
+
+    results = queue.Queue()
+    pending = {"old": {}, "new": {}}
+    running = 0
+    seen = set()
+    with tempfile.TemporaryDirectory(prefix="randoop-diff-") as temp_dir:
+        for version, source_files in (("old", old_files), ("new", new_files)):
+            for offset in range(0, len(entries), chunk_size):
+                job_path = Path(temp_dir) / f"{version}-{offset}.json"
+                write_job(job_path, source_files, entries[offset:offset + chunk_size], offset)
+                threading.Thread(target=stream_outcomes, args=(job_path, version, results), daemon=True).start()
+                running += 1
+
+        while running:
+            version, index, outcomes = results.get()
+            if index is None:
+                running -= 1
+                continue
+            seen.add(index)
+            other = "new" if version == "old" else "old"
+            if index not in pending[other]:
+                pending[version][index] = outcomes
+                continue
+            old, new = (outcomes, pending[other].pop(index))
+            if version == "new":
+                old, new = new, old
+            for position in differences(old, new):
+                yield index, position, old[position] if position < len(old) else None, \
+                    new[position] if position < len(new) else None
+
+    if len(seen) < len(entries):
+        raise RuntimeError(f"{len(entries) - len(seen)} sequence(s) could not be replayed by either version; "
+                           "check that both versions load")
+
+    # Sequences only one version replayed: the other failed to load or crashed
+    for version, unmatched in pending.items():
+        for index, outcomes in sorted(unmatched.items()):
+            yield (index, None, outcomes, None) if version == "old" else (index, None, None, outcomes)
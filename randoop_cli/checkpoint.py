@@ -0,0 +1,118 @@
+import copy
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+from .sequence_store import SequenceStore
+
+
+def is_picklable(obj):
+    try:
+        pickle.dumps(obj)
+        return True
+    except Exception:
+        return False
+
+
+def picklable_sequences(sequences, pools, skip_classes=()):
+    """
+    Re-encodes recorded calls into a new `SequenceStore` over the picklable part of `pools`.
+    Calls are decoded one at a time, so the memory budget holds. Values that referred to a
+    dropped object are kept as captured reprs, and the calls of `skip_classes` are left out.
+
+    Returns:
+        SequenceStore: A store whose `pools` are the picklable pools it refers to.
+    """
+    picklable_pools = {
+        cls_name: [instance for instance in instances if is_picklable(instance)]
+        for cls_name, instances in pools.items()
+    }
+    memory_budget = getattr(sequences, "memory_budget", 64 * 1024 * 1024)
+    store = SequenceStore(picklable_pools, memory_budget)
+    for index, call in enumerate(sequences):
+        if call[0] not in skip_classes:
+            store.append(call, sequences.sequence_of(index) if isinstance(sequences, SequenceStore) else 0)
+    return store
+
+
+def picklable_state(state):
+    """
+    Builds a picklable version of the generator state when some objects cannot be pickled
+    (open files, locks, coroutines, ...), so one odd object does not prevent checkpointing
+    the rest. Unpicklable pooled objects are dropped, and recorded values that referred to
+    them are kept as reprs. A class whose driven instance cannot be saved starts its
+    sequence over on resume: its calls are dropped and its count is reset, since the
+    remaining calls could not be continued on another instance.
+    """
+    lost = {cls_name for cls_name, instance in state["instances"].items() if not is_picklable(instance)}
+    sequences = picklable_sequences(state["sequences"], state["storage"], lost)
+    return dict(
+        state,
+        storage=sequences.pools,
+        sequences=sequences,
+        instances={cls_name: instance for cls_name, instance in state["instances"].items() if cls_name not in lost},
+        completed={cls_name: 0 if cls_name in lost else count for cls_name, count in state["completed"].items()},
+        error_buckets=picklable_error_buckets(state["error_buckets"]),
+    )
+
+
+def picklable_error_buckets(error_buckets):
+    """
+    Returns a copy of the error buckets whose unpicklable failing inputs are replaced by their reprs.
+    """
+    error_buckets = copy.copy(error_buckets)
+    error_buckets.buckets = {key: dict(bucket) for key, bucket in error_buckets.buckets.items()}
+    for bucket in error_buckets.buckets.values():
+        cls_name, method_name, args, message = bucket["case"]
+        if not is_picklable(args):
+            bucket["case"] = (cls_name, method_name, [repr(arg) for arg in args], message)
+    return error_buckets
+
+
+def dump_with_fallback(obj, f, fallback):
+    """
+    Pickles `obj` into the open file `f`. If some object cannot be pickled, whatever was
+    written is discarded and `fallback(obj)` is pickled instead.
+    """
+    start = f.tell()
+    try:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        f.seek(start)
+        f.truncate()
+        pickle.dump(fallback(obj), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def save_checkpoint(path, state):
+    """
+    Atomically writes the generator state to `path`: the state is pickled to a temporary
+    file in the same directory, which then replaces the previous checkpoint, so an
+    interruption mid-write never leaves a truncated checkpoint behind.
+
+    Args:
+        path (Path): Checkpoint file to write.
+        state (dict): Generator state, as built by `randoop_test_generator`.
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.resolve().parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # Pickled straight into the file, so the sequence store is streamed rather than copied
+            dump_with_fallback(state, f, picklable_state)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_checkpoint(path):
+    """
+    Reads a checkpoint written by `save_checkpoint`. The target modules must already be
+    loaded, since pickled instances refer to their classes by module name.
+    """
+    with open(path, "rb") as f:
+        return pickle.load(f)
@@ -1,23 +1,23 @@
 import click
 from pathlib import Path
-import requests
-import zipfile
 import os
 import shutil
-from io import BytesIO
+import sys
 from .module_loader import load_module
-from .class_inspection import get_classes
-from .test_generator import randoop_test_generator, write_regression_tests
+from .sharding import parse_shard
 import time
 from rich.console import Console
-from rich.progress import Progress
-import time
+
+# Everything else, including `requests`, `coverage` and the generator itself, is imported
+# by the commands that use it, so that `--help` and short invocations start quickly.
 
 
 console = Console()
 
 def simulate_loading(task_name, steps=5, delay=0.5):
     """Simulates a loading process with a progress bar."""
+    from rich.progress import Progress
+
     with Progress(console=console) as progress:
         task = progress.add_task(f"[cyan]{task_name}...", total=steps)
         for _ in range(steps):
@@ -28,6 +28,10 @@ def download_and_extract_repo(repo_url, temp_dir):
     """
     Downloads a GitHub repository as a zip file and extracts it to a temporary directory.
     """
+    import requests
+    import zipfile
+    from io import BytesIO
+
     if not repo_url.endswith(".git"):
         repo_url = repo_url.rstrip("/") + ".git"
     
@@ -73,16 +77,17 @@ def parse_imports(file_path):
                 imports.append(match.group(1).split('.')[0])  # Extract the module name
     return imports
 
-def resolve_dependencies(source_files):
+def resolve_dependencies(source_files, imports_of=parse_imports):
     """
     Resolve file loading order based on import dependencies using topological sorting.
+    `imports_of` maps a file to the modules it imports (parsed from the file by default).
     """
     dependency_graph = defaultdict(set)
     file_map = {file.stem: file for file in source_files}
 
     # Build the dependency graph
     for file in source_files:
-        imports = parse_imports(file)
+        imports = imports_of(file)
         for module in imports:
             if module in file_map:  # Only consider local modules
                 dependency_graph[file.stem].add(module)
@@ -111,32 +116,230 @@ def resolve_dependencies(source_files):
     return [file_map[stem] for stem in resolved]
 
 
+def validate_shard(ctx, param, value):
+    if value is None:
+        return None
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def print_results(test_results):
+    """
+    Displays the generated sequences and one representative per error bucket.
+    """
+    print("\n-----> Generated Instances and Sequences:")
+    for seq in test_results["sequences"]:
+        print(seq)
+
+    print("\n-----> Error-Prone Test Cases:")
+    for count, error in test_results["error_buckets"].summary():
+        print(f"[{count}x]", error)
+
+
+def print_flakiness_report(report, tot_sequences):
+    """
+    Lists the sequences whose replays disagreed with each other or with the generation run.
+    """
+    print("\n-----> Flaky Sequences:")
+    for label, key in (("flaky", "flaky"), ("differs from generation", "stale"), ("raises on replay", "failing")):
+        for index in report[key]:
+            calls = ", ".join(method_name for _, method_name, _, _ in tot_sequences[index])
+            print(f"[{label}] #{index} {tot_sequences[index][0][0]}: {calls}")
+    unstable = sum(len(actions) for actions in report["unstable"].values())
+    print(f"{unstable} assertion(s) downgraded or dropped")
+
+
+# Options of a generation run, shared by the `generate` command and the bare `randoop-cli` invocation
+GENERATION_OPTIONS = [
+    click.option(
+        "-k",
+        "--sequence-length",
+        type=int,
+        default=10,
+        help="Number of times to extend the sequence (default: 2)",
+        show_default=True,
+    ),
+    click.option(
+        "--repo-url",
+        type=str,
+        default=None,
+        help="GitHub repository URL to process.",
+    ),
+    click.option(
+        "-f",
+        "--file",
+        "file_paths",
+        type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+        multiple=True,
+        help="Path to individual Python files to process (use -f multiple times for multiple files).",
+    ),
+    click.option(
+        "--constant-probability",
+        type=click.FloatRange(0.0, 1.0),
+        default=0.2,
+        help="Probability of using a literal mined from the source files as an argument (0 disables constant mining).",
+        show_default=True,
+    ),
+    click.option(
+        "--async-timeout",
+        type=float,
+        default=5.0,
+        help="Seconds to wait for each call of an async (coroutine) method before recording a timeout.",
+        show_default=True,
+    ),
+    click.option(
+        "--profile",
+        is_flag=True,
+        default=False,
+        help="Record latency and allocations of every call and report the hot spots of each class.",
+    ),
+    click.option(
+        "--perf-tests",
+        is_flag=True,
+        default=False,
+        help="Also write performance regression tests with baselines recorded during generation.",
+    ),
+    click.option(
+        "--perf-factor",
+        type=float,
+        default=3.0,
+        help="How many times slower than its baseline a sequence may get before its performance test fails.",
+        show_default=True,
+    ),
+    click.option(
+        "--perf-floor",
+        type=click.FloatRange(min=0.0),
+        default=1e-6,
+        help="Smallest time budget, in seconds per replay, of a performance test.",
+        show_default=True,
+    ),
+    click.option(
+        "--update-baselines",
+        is_flag=True,
+        default=False,
+        help="Re-measure baselines that are already recorded in the baseline file.",
+    ),
+    click.option(
+        "--checkpoint",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="File to periodically save the generator state to, so an interrupted run can be resumed.",
+    ),
+    click.option(
+        "--checkpoint-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between two checkpoints.",
+        show_default=True,
+    ),
+    click.option(
+        "--resume",
+        is_flag=True,
+        default=False,
+        help="Continue from the last checkpoint written to --checkpoint.",
+    ),
+    click.option(
+        "--shard",
+        type=str,
+        default=None,
+        callback=validate_shard,
+        help="Only drive the classes of one shard, e.g. 3/16. Classes are assigned by a hash of their qualified name.",
+    ),
+    click.option(
+        "--shard-output",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="Result file for the shard (default: shard-INDEX-of-COUNT.pkl). Combine shards with `randoop-cli merge`.",
+    ),
+    click.option(
+        "--memory-budget",
+        type=click.IntRange(min=1),
+        default=64,
+        help="MiB of packed sequence records kept in memory before older records are spilled to disk.",
+        show_default=True,
+    ),
+    click.option(
+        "--purity-analysis/--no-purity-analysis",
+        default=True,
+        help="Skip repeated calls to side-effect-free methods on unchanged receivers.",
+        show_default=True,
+    ),
+    click.option(
+        "--contract-interval",
+        type=click.IntRange(min=0),
+        default=100,
+        help="Check equality, hashing, str/repr and pickling contracts of pooled objects every N calls (0 disables).",
+        show_default=True,
+    ),
+    click.option(
+        "--boundary-probability",
+        type=click.FloatRange(0.0, 1.0),
+        default=0.1,
+        help="Probability of using a boundary value (0, ±1, min/max, NaN, inf, empty or very long strings) as an argument.",
+        show_default=True,
+    ),
+    click.option(
+        "--mutation-probability",
+        type=click.FloatRange(0.0, 1.0),
+        default=0.2,
+        help="Probability of mutating the arguments of an earlier call that reached new branches of the same method.",
+        show_default=True,
+    ),
+    click.option(
+        "--call-timeout",
+        type=click.FloatRange(min=0.0),
+        default=2.0,
+        help="Seconds a single call may run before it is interrupted and recorded as an error (0 disables).",
+        show_default=True,
+    ),
+    click.option(
+        "--max-string-length",
+        type=click.IntRange(min=1),
+        default=10000,
+        help="Length of the longest string argument generated.",
+        show_default=True,
+    ),
+    click.option(
+        "-o",
+        "--output",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="Result file to save the generated sequences to, for `write`, `merge` and `diff --corpus`.",
+    ),
+    click.option(
+        "--window",
+        type=click.IntRange(min=0),
+        default=0,
+        help="Drive a fresh instance every N calls of a class, recording many short sequences whose "
+             "shapes repeat (0 drives one instance per class).",
+        show_default=True,
+    ),
+]
+
+
+def generation_options(command):
+    for option in reversed(GENERATION_OPTIONS):
+        command = option(command)
+    return command
+
+
+def run_generation(sequence_length, repo_url, file_paths, constant_probability, async_timeout, profile,
+                   perf_tests, perf_factor, perf_floor, update_baselines, checkpoint, checkpoint_interval, resume,
+                   shard, shard_output, memory_budget, purity_analysis, contract_interval, boundary_probability,
+                   mutation_probability, call_timeout, max_string_length, output, window):
+    """
+    Loads the target files, generates sequences for their classes and reports the results.
+    """
+    from .test_generator import randoop_test_generator, group_sequences
+    from .constant_mining import build_constant_pools
+    from .profiling import MethodProfiler
+    from .checkpoint import load_checkpoint
+    from .purity import PurityOracle
+    from .contracts import ContractChecker
+    from .strategies import ValueStrategy
 
-@click.command()
-@click.option(
-    "-k",
-    "--sequence-length",
-    type=int,
-    default=10,
-    help="Number of times to extend the sequence (default: 2)",
-    show_default=True,
-)
-@click.option(
-    "--repo-url",
-    type=str,
-    default=None,
-    help="GitHub repository URL to process.",
-)
-@click.option(
-    "-f",
-    "--file",
-    "file_paths",
-    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
-    multiple=True,
-    help="Path to individual Python files to process (use -f multiple times for multiple files).",
-)
-def main(sequence_length, repo_url, file_paths):
-    """Python Randoop test generator for Python classes."""
     console.print("[bold blue]Randoop-Python Test Generator[/bold blue]\n")
     # Temporary directory for repository
     temp_dir = Path("temp_repo")
@@ -185,18 +388,72 @@ def main(sequence_length, repo_url, file_paths):
 
     
 
+        # Mine literals from the source files to seed the value generators
+        constant_pools = build_constant_pools(source_files) if constant_probability > 0 else None
+
         # Simulate loading for test generation
         simulate_loading("Generating Random tests")
-        test_results = randoop_test_generator(all_classes, sequence_length)
+        resume_state = None
+        if resume:
+            if not checkpoint:
+                console.print("[bold red]--resume requires --checkpoint.[/bold red]")
+                exit(1)
+            if checkpoint.exists():
+                resume_state = load_checkpoint(checkpoint)
+            else:
+                console.print(f"[bold yellow]No checkpoint found at {checkpoint}, starting a new run.[/bold yellow]")
+
+        profiler = MethodProfiler() if profile else None
+        strategy = None
+        if boundary_probability or mutation_probability or call_timeout:
+            strategy = ValueStrategy(source_files, boundary_probability, mutation_probability, call_timeout,
+                                     max_string_length)
+
+        def generate():
+            return randoop_test_generator(
+                all_classes, sequence_length, constant_pools, constant_probability, async_timeout, profiler,
+                checkpoint, checkpoint_interval, resume_state, shard, memory_budget * 1024 * 1024,
+                PurityOracle(all_classes) if purity_analysis else None,
+                ContractChecker(contract_interval, strategy=strategy) if contract_interval else None, strategy, window,
+            )
+
+        if shard:
+            # Shard results carry their coverage so merged reports cover the whole class set
+            from .coverage_analysis import measure_coverage
+            from .sharding import read_sources, write_shard_result
+
+            test_results, coverage_lines = measure_coverage(generate, source_files)
+            shard_output = shard_output or Path(f"shard-{shard[0]}-of-{shard[1]}.pkl")
+            write_shard_result(shard_output, shard, read_sources(source_files), test_results, coverage_lines)
+            console.print(f"[bold green]Shard {shard[0]}/{shard[1]} results written to {shard_output}[/bold green]")
+        else:
+            test_results = generate()
+            if output:
+                # Same format as a shard result; coverage is only measured for shards
+                from .sharding import read_sources, write_shard_result
+
+                write_shard_result(output, None, read_sources(source_files), test_results, {})
+                console.print(f"[bold green]Results written to {output}[/bold green]")
 
         # Display Successful Sequences
-        print("\n-----> Generated Instances and Sequences:")
-        for seq in test_results["sequences"]:
-            print(seq)
+        print_results(test_results)
+
+        if profiler is not None:
+            print("\n-----> Performance Hot Spots:")
+            profiler.print_report(console)
+
+        if perf_tests:
+            from .perf_regression import write_performance_tests
 
-        print("\n-----> Error-Prone Test Cases:")
-        for error in test_results["error_cases"]:
-            print(error)
+            write_performance_tests(
+                group_sequences(test_results["sequences"]),
+                {str(cls): cls for _, cls in all_classes},
+                source_files,
+                test_results["async_methods"],
+                factor=perf_factor,
+                floor=perf_floor,
+                update_baselines=update_baselines,
+            )
 
         console.print("[bold green]All tasks completed successfully![/bold green]")
     finally:
@@ -204,5 +461,245 @@ def main(sequence_length, repo_url, file_paths):
         if repo_url and temp_dir.exists():
             shutil.rmtree(temp_dir)
 
+
+@click.group(invoke_without_command=True)
+@click.pass_context
+@generation_options
+def main(ctx, **options):
+    """Python Randoop test generator for Python classes."""
+    if ctx.invoked_subcommand is None:
+        run_generation(**options)
+
+
+@main.command()
+@generation_options
+def generate(**options):
+    """Generate sequences for the classes of the given files or repository."""
+    run_generation(**options)
+
+
+@main.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Unix socket to listen on (default: a per-user socket in the temp directory).",
+)
+def serve(socket_path):
+    """Run a daemon that keeps loaded modules warm between generation jobs."""
+    from .client import default_socket_path
+    from .daemon import serve_forever
+
+    serve_forever(socket_path or default_socket_path())
+
+
+@main.command()
+@click.option("-k", "--sequence-length", type=int, default=10, show_default=True,
+              help="Number of method invocations per class.")
+@click.option("-f", "--file", "file_paths", multiple=True, required=True,
+              type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+              help="Path to individual Python files to process (use -f multiple times for multiple files).")
+@click.option("--constant-probability", type=click.FloatRange(0.0, 1.0), default=0.2, show_default=True,
+              help="Probability of using a literal mined from the source files as an argument.")
+@click.option("--async-timeout", type=float, default=5.0, show_default=True,
+              help="Seconds to wait for each call of an async (coroutine) method.")
+@click.option("--purity-analysis/--no-purity-analysis", default=True, show_default=True,
+              help="Skip repeated calls to side-effect-free methods on unchanged receivers.")
+@click.option("--contract-interval", type=click.IntRange(min=0), default=100, show_default=True,
+              help="Check the general contracts of pooled objects every N calls (0 disables).")
+@click.option("--boundary-probability", type=click.FloatRange(0.0, 1.0), default=0.1, show_default=True,
+              help="Probability of using a boundary value as an argument.")
+@click.option("--mutation-probability", type=click.FloatRange(0.0, 1.0), default=0.2, show_default=True,
+              help="Probability of mutating the arguments of an earlier call that reached new branches.")
+@click.option("--call-timeout", type=click.FloatRange(min=0.0), default=2.0, show_default=True,
+              help="Seconds a single call may run before it is interrupted (0 disables).")
+@click.option("--max-string-length", type=click.IntRange(min=1), default=10000, show_default=True,
+              help="Length of the longest string argument generated.")
+@click.option("--window", type=click.IntRange(min=0), default=0, show_default=True,
+              help="Drive a fresh instance every N calls of a class (0 drives one instance per class).")
+@click.option("--socket", "socket_path", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="Unix socket of the daemon started with `randoop-cli serve`.")
+def submit(file_paths, socket_path, **options):
+    """Send a generation job to a running `randoop-cli serve` daemon."""
+    from .client import submit_job, default_socket_path
+
+    job = dict(options, files=[str(path.resolve()) for path in file_paths])
+    exit(submit_job(socket_path or default_socket_path(), job))
+
+
+# Options of test writing, shared by `merge --write-tests` and `write`
+TEST_OPTIONS = [
+    click.option("--oracle", type=click.Choice(["inline", "snapshot"]), default="inline", show_default=True,
+                 help="Write expected results as assertions, or store them in a snapshot file next to the tests."),
+    click.option("--tolerance", type=float, default=1e-9, show_default=True,
+                 help="Relative tolerance of numeric comparisons with the snapshot oracle."),
+    click.option("--atol", type=float, default=1e-12, show_default=True,
+                 help="Absolute tolerance of numeric comparisons with the snapshot oracle, for results near zero."),
+    click.option("--layout", type=click.Choice(["functions", "table"]), default="functions", show_default=True,
+                 help="Write one test function per sequence, or one parametrized test per sequence shape."),
+    click.option("--verify-runs", type=click.IntRange(min=0), default=3, show_default=True,
+                 help="Replay each sequence this many times in worker processes before writing tests, "
+                      "with different hash seeds and orders; results that vary lose their assertions (0 disables)."),
+]
+
+
+def test_options(command):
+    for option in reversed(TEST_OPTIONS):
+        command = option(command)
+    return command
+
+
+def write_tests(results, oracle, tolerance, atol, layout, verify_runs):
+    """
+    Writes regression_tests.py for a loaded result file against the target files of the working tree.
+    """
+    from .test_generator import write_regression_tests
+
+    # Let the tests import the target files of the working tree, not the embedded copies
+    for stem in results["sources"]:
+        sys.modules.pop(stem, None)
+    tot_sequences = results["sequences"]
+    file_paths = [Path(f"{stem}.py") for stem in results["sources"]]
+    missing = [str(file_path) for file_path in file_paths if not file_path.exists()]
+    if missing:
+        console.print(f"[bold red]Target files not found in the working directory: {', '.join(missing)}[/bold red]")
+        exit(1)
+    unstable = None
+    if verify_runs:
+        from .flakiness import verify_sequences
+
+        try:
+            report = verify_sequences(tot_sequences, file_paths, results["async_methods"], runs=verify_runs)
+        except RuntimeError as e:
+            # Without replays, every assertion would look unstable and be dropped
+            console.print(f"[bold red]Could not verify the sequences: {e}[/bold red]")
+            exit(1)
+        print_flakiness_report(report, tot_sequences)
+        unstable = report["unstable"]
+    write_regression_tests(
+        tot_sequences, None, file_paths, results["async_methods"],
+        oracle=oracle, rtol=tolerance, atol=atol, unstable=unstable, layout=layout,
+    )
+
+
+@main.command()
+@click.argument("shard_files", nargs=-1, required=True,
+                type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), default=Path("merged.pkl"),
+              show_default=True, help="Result file for the merged corpus.")
+@click.option("--write-tests", "write_tests_flag", is_flag=True, default=False,
+              help="Write regression_tests.py for the merged corpus (the target files must be importable).")
+@test_options
+def merge(shard_files, output, write_tests_flag, oracle, tolerance, atol, layout, verify_runs):
+    """Combine shard result files into one deduplicated corpus, report and test suite."""
+    from .sharding import load_shard_results, merge_shard_results, write_shard_result
+
+    merged = merge_shard_results(load_shard_results(shard_files, console))
+    print_results(merged)
+
+    print("\n-----> Covered Lines:")
+    for stem, lines in merged["coverage"].items():
+        print(f"{stem}: {len(lines)} lines")
+
+    write_shard_result(output, None, merged["sources"], merged, merged["coverage"])
+    console.print(
+        f"[bold green]Merged {len(shard_files)} shard(s) ({len(merged['sequences'])} sequences) into {output}[/bold green]"
+    )
+
+    if write_tests_flag:
+        write_tests(merged, oracle, tolerance, atol, layout, verify_runs)
+
+
+@main.command()
+@click.argument("result_file", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@test_options
+def write(result_file, oracle, tolerance, atol, layout, verify_runs):
+    """Write regression_tests.py from a shard or merged result file."""
+    from .sharding import load_shard_results, merge_shard_results
+
+    write_tests(merge_shard_results(load_shard_results([result_file], console)), oracle, tolerance, atol, layout,
+                verify_runs)
+
+
+@main.command("coverage")
+@click.argument("test_file", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("-f", "--file", "file_paths", multiple=True, required=True,
+              type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+              help="Target file to report coverage for (use -f multiple times for multiple files).")
+def coverage_command(test_file, file_paths):
+    """Run a test file and report the branch coverage of the target files."""
+    from .coverage_analysis import print_coverage
+
+    for file_path in file_paths:
+        print_coverage(str(test_file), file_path)
+
+
+@main.command()
+@click.argument("repo_url")
+@click.option("-o", "--output", type=click.Path(file_okay=False, path_type=Path), default=Path("temp_repo"),
+              show_default=True, help="Directory to extract the repository into.")
+def fetch(repo_url, output):
+    """Download a GitHub repository and list the source files generation would process."""
+    download_and_extract_repo(repo_url, output)
+    repo_root = next(output.iterdir())  # First directory inside the extracted repo
+    for file_path in resolve_dependencies(identify_source_files(repo_root)):
+        print(file_path)
+
+
+@main.command()
+@click.argument("old", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.argument("new", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--corpus", type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None,
+              help="Shard or merged result file to replay (default: generate a corpus from OLD).")
+@click.option("-k", "--sequence-length", type=int, default=10, show_default=True,
+              help="Number of method invocations per class when generating the corpus.")
+@click.option("--workers", type=click.IntRange(min=1), default=None,
+              help="Worker processes per version (default: half the CPU count).")
+def diff(old, new, corpus, sequence_length, workers):
+    """Report the behaviors that differ between two versions of a codebase."""
+    from collections import Counter
+    from contextlib import redirect_stdout
+    from .behavior_diff import diff_versions, describe_outcome
+    from .test_generator import randoop_test_generator, group_sequences, class_name
+
+    old_files = resolve_dependencies(identify_source_files(old))
+    new_files = resolve_dependencies(identify_source_files(new))
+    if corpus:
+        from .sharding import load_shard_results, merge_shard_results
+
+        results = merge_shard_results(load_shard_results([corpus], console))
+        tot_sequences = results["sequences"]
+    else:
+        namespace = {}
+        console.print(f"[bold green]Generating a corpus from {old}...[/bold green]")
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for file_path in old_files:
+                load_module(file_path, namespace, console)
+            classes = [(name, obj) for name, obj in namespace.items() if isinstance(obj, type)]
+            results = randoop_test_generator(classes, sequence_length)
+        tot_sequences = group_sequences(results["sequences"])
+
+    print(f"\n-----> Behavioral Differences ({old} -> {new}):")
+    by_method = Counter()
+    changed = set()
+    for index, position, old_outcome, new_outcome in diff_versions(
+            tot_sequences, old_files, new_files, results["async_methods"], workers):
+        changed.add(index)
+        sequence = tot_sequences[index]
+        if position is None:
+            method = f"{class_name(sequence[0][0])} (not replayed)"
+        else:
+            method = f"{class_name(sequence[position][0])}.{sequence[position][1]}"
+        by_method[method] += 1
+        print(f"[{method}] #{index} call {position}: {describe_outcome(old_outcome)} -> {describe_outcome(new_outcome)}")
+
+    print("\n-----> Differences by Method:")
+    for method, count in by_method.most_common():
+        print(f"[{count}x] {method}")
+    console.print(f"[bold green]{sum(by_method.values())} call(s) in {len(changed)} of {len(tot_sequences)} "
+                  "sequence(s) behave differently[/bold green]")
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+# The client only depends on the standard library, so submitting a job to a warm
+# daemon does not pay for importing the generator and its dependencies.
+
+# Generation options of a job, with the defaults of `randoop-cli`
+JOB_DEFAULTS = {
+    "sequence_length": 10,
+    "constant_probability": 0.2,
+    "async_timeout": 5.0,
+    "purity_analysis": True,
+    "contract_interval": 100,
+    "boundary_probability": 0.1,
+    "mutation_probability": 0.2,
+    "call_timeout": 2.0,
+    "max_string_length": 10000,
+    "window": 0,
+}
+
+
+def default_socket_path():
+    """
+    Returns the per-user socket `randoop-cli serve` listens on by default.
+    """
+    return os.path.join(tempfile.gettempdir(), f"randoop-cli-{os.getuid()}.sock")
+
+
+def submit_job(socket_path, job, out=None):
+    """
+    Sends a generation job to the daemon and streams its output back as it is produced.
+
+    Args:
+        socket_path (str): Unix socket the daemon listens on.
+        job (dict): Job description (source files and generation options).
+        out (file): Where to write the streamed output (stdout by default).
+
+    Returns:
+        int: 0 if the job completed, 1 otherwise.
+    """
+    out = out or sys.stdout
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(str(socket_path))
+            conn.sendall(json.dumps(job).encode("utf-8") + b"\n")
+            with conn.makefile("r", encoding="utf-8") as stream:
+                for line in stream:
+                    message = json.loads(line)
+                    if message["type"] == "output":
+                        out.write(message["text"])
+                        out.flush()
+                    elif message["type"] == "done":
+                        if message.get("error"):
+                            out.write(f"Job failed: {message['error']}\n")
+                            return 1
+                        return 0
+    except (FileNotFoundError, ConnectionRefusedError):
+        out.write(f"No randoop-cli daemon is listening on {socket_path}. Start one with `randoop-cli serve`.\n")
+        return 1
+    out.write("Connection to the daemon was closed before the job completed.\n")
+    return 1
+
+
+def main(argv=None):
+    """
+    Entry point of `randoop-submit` and `python -m randoop_cli.client`: the `submit`
+    command without importing the CLI, for callers that submit jobs many times an hour.
+    """
+    parser = argparse.ArgumentParser(prog="randoop-submit", description="Send a generation job to a running "
+                                     "`randoop-cli serve` daemon.")
+    parser.add_argument("-f", "--file", dest="file_paths", action="append", required=True,
+                        help="Path to individual Python files to process (use -f multiple times for multiple files).")
+    parser.add_argument("-k", "--sequence-length", type=int)
+    parser.add_argument("--constant-probability", type=float)
+    parser.add_argument("--async-timeout", type=float)
+    parser.add_argument("--purity-analysis", action=argparse.BooleanOptionalAction)
+    parser.add_argument("--contract-interval", type=int)
+    parser.add_argument("--boundary-probability", type=float)
+    parser.add_argument("--mutation-probability", type=float)
+    parser.add_argument("--call-timeout", type=float)
+    parser.add_argument("--max-string-length", type=int)
+    parser.add_argument("--window", type=int)
+    parser.add_argument("--socket", dest="socket_path", default=None,
+                        help="Unix socket of the daemon started with `randoop-cli serve`.")
+    parser.set_defaults(**JOB_DEFAULTS)
+    options = vars(parser.parse_args(argv))
+
+    for file_path in options["file_paths"]:
+        if not Path(file_path).is_file():
+            parser.error(f"file {file_path!r} does not exist")
+    job = {option: options[option] for option in JOB_DEFAULTS}
+    job["files"] = [str(Path(file_path).resolve()) for file_path in options["file_paths"]]
+    return submit_job(options["socket_path"] or default_socket_path(), job)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
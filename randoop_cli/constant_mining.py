@@ -0,0 +1,98 @@
+import ast
+from collections import defaultdict
+from pathlib import Path
+
+
+def boundary_values(value):
+    """
+    Returns the values just around a numeric literal, so comparisons such as
+    `amount > limit` can be driven to both sides of the boundary.
+    """
+    if isinstance(value, bool):
+        return [value, not value]
+    if isinstance(value, int):
+        return [value - 1, value, value + 1]
+    if isinstance(value, float):
+        return [value - 1e-9, value, value + 1e-9]
+    return [value]
+
+
+def mine_constants(file_path):
+    """
+    Collects the numeric and string literals of a Python source file.
+
+    Args:
+        file_path (Path): Path to the Python file to analyze.
+
+    Returns:
+        dict: A dictionary with a "module" pool holding every literal of the file
+              and a "classes" mapping from class names to the literals found in their bodies.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=str(file_path))
+
+    module_pool = set()
+    class_pools = defaultdict(set)
+
+    def collect(node, pool):
+        for child in ast.walk(node):
+            if not isinstance(child, ast.Constant):
+                continue
+            value = child.value
+            if isinstance(value, (int, float)):
+                pool.update(boundary_values(value))
+            elif isinstance(value, str) and value and len(value) <= 100:
+                pool.add(value)
+
+    collect(tree, module_pool)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            collect(node, class_pools[node.name])
+
+    # Docstrings are string literals too, but they never guard a branch.
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            docstring = ast.get_docstring(node, clean=False)
+            if docstring:
+                module_pool.discard(docstring)
+                for pool in class_pools.values():
+                    pool.discard(docstring)
+
+    return {"module": module_pool, "classes": dict(class_pools)}
+
+
+def build_constant_pools(source_files):
+    """
+    Mines every source file and indexes the pools by module name (the file stem),
+    matching the names `load_module` registers the modules under.
+    """
+    return {Path(file_path).stem: mine_constants(file_path) for file_path in source_files}
+
+
+def pool_order(value):
+    return type(value).__name__, repr(value)
+
+
+def constants_for_class(cls, constant_pools):
+    """
+    Returns the literals relevant to a class, bucketed by the parameter type they
+    can be passed as. Literals of the class body come first, then the rest of its module.
+    """
+    constants = {int: [], float: [], str: []}
+    pools = constant_pools.get(cls.__module__) if constant_pools else None
+    if not pools:
+        return constants
+
+    # Sets iterate in PYTHONHASHSEED-dependent order; sorting keeps random choices reproducible
+    class_pool = pools["classes"].get(cls.__name__, set())
+    for value in sorted(class_pool, key=pool_order) + sorted(pools["module"] - class_pool, key=pool_order):
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, int):
+            constants[int].append(value)
+            constants[float].append(value)
+        elif isinstance(value, float):
+            constants[float].append(value)
+        elif isinstance(value, str):
+            constants[str].append(value)
+    return constants
@@ -0,0 +1,234 @@
+import inspect
+import pickle
+import random
+from contextlib import nullcontext
+
+from .purity import fingerprint
+from .strategies import CallTimeout
+from .test_generator import class_name, format_args
+
+
+class ContractViolation(Exception):
+    """
+    A pooled object breaks a general contract of Python objects.
+    """
+
+    def __init__(self, contract, message):
+        super().__init__(f"{contract}: {message}")
+        self.contract = contract
+
+
+def defines_eq(obj):
+    return type(obj).__eq__ is not object.__eq__
+
+
+def check_eq_reflexive(obj):
+    try:
+        if not obj == obj:
+            return "x == x is false"
+    except Exception as e:
+        return f"x == x raised {type(e).__name__}: {e}"
+    return None
+
+
+def check_str_repr(obj):
+    for render in (str, repr):
+        try:
+            render(obj)
+        except Exception as e:
+            return f"{render.__name__}(x) raised {type(e).__name__}: {e}"
+    return None
+
+
+def check_pickle_roundtrip(obj):
+    try:
+        copy = pickle.loads(pickle.dumps(obj))
+    except Exception as e:
+        return f"pickling raised {type(e).__name__}: {e}"
+    try:
+        if defines_eq(obj) and not copy == obj:
+            return "the unpickled copy is not equal to x"
+    except Exception as e:
+        return f"comparing the unpickled copy raised {type(e).__name__}: {e}"
+    return None
+
+
+def check_eq_symmetric(a, b):
+    try:
+        if bool(a == b) != bool(b == a):
+            return "x == y and y == x disagree"
+    except Exception:
+        return None  # An __eq__ that raises is reported by the reflexivity check
+    return None
+
+
+def check_hash_consistent(a, b):
+    if type(a).__hash__ is None or type(b).__hash__ is None:
+        return None  # Unhashable objects make no promise
+    try:
+        if a == b and hash(a) != hash(b):
+            return "x == y but hash(x) != hash(y)"
+    except Exception as e:
+        return f"hash raised {type(e).__name__}: {e}"
+    return None
+
+
+# Contracts on one object and on pairs of objects of the same pool
+SINGLE_CONTRACTS = {
+    "eq-reflexive": check_eq_reflexive,
+    "str-repr": check_str_repr,
+    "pickle-roundtrip": check_pickle_roundtrip,
+}
+PAIR_CONTRACTS = {
+    "eq-symmetric": check_eq_symmetric,
+    "hash-consistent": check_hash_consistent,
+}
+
+
+class ContractChecker:
+    """
+    Checks the general contracts of the objects in the generator's pools, in batches every
+    `interval` calls instead of after every call. Objects whose state has not changed since
+    their last check are skipped, and each object is paired with at most `max_pairs` others.
+
+    `history` records how each pooled object was built, as (class, constructor args, calls),
+    so that a violation can be reported with the fewest calls that reproduce it. Only the
+    first `max_history` calls of an object are kept; an object driven for longer, like one
+    created before a `--resume` (the history is not checkpointed), is reported without its
+    provenance. Minimizing a violation rebuilds objects at most `max_replays` times, and
+    every replayed call runs under the time budget of `strategy`, if one is given.
+    """
+
+    def __init__(self, interval=100, max_pairs=8, max_history=64, max_replays=200, strategy=None):
+        self.interval = interval
+        self.max_pairs = max_pairs
+        self.max_history = max_history
+        self.max_replays = max_replays
+        self.strategy = strategy
+        self.history = {}
+        self.replays = 0  # Rebuilds done by the current minimization
+        self.calls = 0
+        self.checked = {}  # id(object) -> fingerprint at its last check
+        self.reported = set()
+
+    def record_call(self, instance, method_name, args):
+        entry = self.history.get(id(instance))
+        if entry is None or entry[2] is None:
+            return
+        if len(entry[2]) < self.max_history:
+            entry[2].append((method_name, list(args)))
+        else:
+            # Too long to replay cheaply: let go of the calls and the arguments they hold
+            self.history[id(instance)] = (entry[0], entry[1], None)
+
+    def replayable(self, obj):
+        entry = self.history.get(id(obj))
+        return entry is not None and entry[2] is not None
+
+    def guarded(self, cls, method_name, args):
+        if self.strategy is None:
+            return nullcontext()
+        return self.strategy.guard(str(cls), method_name, args, trace=False)
+
+    def due(self):
+        self.calls += 1
+        return self.calls % self.interval == 0
+
+    def rebuild(self, obj, calls):
+        """
+        Builds a fresh object like `obj` and replays the given recorded calls on it, or returns None.
+        """
+        cls, init_args, _ = self.history[id(obj)]
+        self.replays += 1
+        try:
+            with self.guarded(cls, "__init__", init_args):
+                rebuilt = cls(*init_args)
+        except (CallTimeout, Exception):
+            return None
+        for method_name, args in calls:
+            try:
+                with self.guarded(cls, method_name, args):
+                    result = getattr(rebuilt, method_name)(*args)
+                if inspect.iscoroutine(result):
+                    result.close()
+            except CallTimeout:
+                return None
+            except Exception:
+                pass  # The generation run saw the same failure
+        return rebuilt
+
+    def reproduces(self, objects, kept, check):
+        if self.replays + len(objects) > self.max_replays:
+            return False  # Out of budget: keep the shortest history found so far
+        rebuilt = [self.rebuild(obj, calls) for obj, calls in zip(objects, kept)]
+        return None not in rebuilt and check(*rebuilt) is not None
+
+    def minimize(self, objects, check):
+        """
+        Shortens the call histories of the objects one at a time, keeping the violation:
+        first to the shortest reproducing prefix, then by dropping single calls, within
+        `max_replays` rebuilds.
+
+        Returns:
+            list: Source lines that rebuild the objects and reproduce the violation.
+        """
+        self.replays = 0
+        known = all(self.replayable(obj) for obj in objects)
+        kept = [list(self.history[id(obj)][2]) if self.replayable(obj) else None for obj in objects]
+        if known and self.reproduces(objects, kept, check):
+            for position in range(len(objects)):
+                calls = kept[position]
+                for length in range(len(calls)):
+                    trial = kept[:position] + [calls[:length]] + kept[position + 1:]
+                    if self.reproduces(objects, trial, check):
+                        kept = trial
+                        break
+                index = len(kept[position]) - 1
+                while index >= 0:
+                    calls = kept[position]
+                    trial = kept[:position] + [calls[:index] + calls[index + 1:]] + kept[position + 1:]
+                    if self.reproduces(objects, trial, check):
+                        kept = trial
+                    index -= 1
+
+        lines = []
+        for name, obj, calls in zip("xy", objects, kept):
+            if calls is None:
+                lines.append(f"{name} = <{type(obj).__name__} without recorded provenance>")
+                continue
+            cls, init_args, _ = self.history[id(obj)]
+            lines.append(f"{name} = {class_name(str(cls))}({format_args(init_args)})")
+            lines.extend(f"{name}.{method_name}({format_args(args)})" for method_name, args in calls)
+        return lines
+
+    def report(self, cls_name, contract, objects, check, message, error_buckets):
+        key = (contract, *(id(obj) for obj in objects))
+        if key in self.reported:
+            return
+        self.reported.add(key)
+        lines = self.minimize(objects, check)
+        if error_buckets.add(cls_name, contract, lines, ContractViolation(contract, message)):
+            print(cls_name, "violates", contract + ":", message, "\n")
+
+    def check(self, storage, error_buckets):
+        """
+        Runs one batch of contract checks over every pool.
+        """
+        for cls_name, pool in storage.items():
+            changed = []
+            for obj in pool:
+                state = fingerprint(obj)
+                if state is None or self.checked.get(id(obj)) != state:
+                    self.checked[id(obj)] = state
+                    changed.append(obj)
+            for obj in changed:
+                for contract, check in SINGLE_CONTRACTS.items():
+                    message = check(obj)
+                    if message:
+                        self.report(cls_name, contract, [obj], check, message, error_buckets)
+                others = [other for other in pool if other is not obj]
+                for other in random.sample(others, min(self.max_pairs, len(others))):
+                    for contract, check in PAIR_CONTRACTS.items():
+                        message = check(obj, other)
+                        if message:
+                            self.report(cls_name, contract, [obj, other], check, message, error_buckets)
@@ -17,3 +17,24 @@ def print_coverage(test_file, actual_file):
 
     _, statements, missing, branches, partial_branches = cov.analysis2(str(Path(actual_file).resolve()))
 
+
+
+def measure_coverage(func, source_files):
+    """
+    Runs `func` under coverage measurement restricted to the given source files.
+
+    Returns:
+        tuple: The result of `func` and a mapping of file stems to the sorted line
+               numbers executed in each file.
+    """
+    resolved = [str(Path(file_path).resolve()) for file_path in source_files]
+    cov = coverage.Coverage(data_file=None, include=resolved)
+    cov.start()
+    try:
+        result = func()
+    finally:
+        cov.stop()
+
+    data = cov.get_data()
+    lines = {Path(file_path).stem: sorted(data.lines(file_path) or []) for file_path in resolved}
+    return result, lines
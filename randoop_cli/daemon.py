@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import socket
+import socketserver
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from rich.console import Console
+
+from .cli import parse_imports, resolve_dependencies, print_results
+from .client import JOB_DEFAULTS
+from .constant_mining import mine_constants
+from .contracts import ContractChecker
+from .module_loader import load_module
+from .purity import PurityOracle
+from .strategies import ValueStrategy
+from .test_generator import randoop_test_generator
+
+console = Console()
+
+
+def file_digest(file_path):
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ModuleCache:
+    """
+    Keeps parsed imports, mined constants and loaded modules of the target files between
+    jobs. A file is re-read only when its mtime or size changed, and reloaded only when
+    its content hash changed too, together with the files that import it.
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def _changed(self, file_path):
+        stat = os.stat(file_path)
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        entry = self.entries.get(file_path)
+        if entry is not None and entry["fingerprint"] == fingerprint:
+            return False
+
+        digest = file_digest(file_path)
+        if entry is not None and entry["digest"] == digest:
+            entry["fingerprint"] = fingerprint  # Touched but unchanged
+            return False
+
+        self.entries[file_path] = {
+            "fingerprint": fingerprint,
+            "digest": digest,
+            "imports": parse_imports(file_path),
+            "constants": mine_constants(file_path),
+            "module": None,
+        }
+        return True
+
+    def refresh(self, source_files, out_console):
+        """
+        Brings the cache up to date with the given files.
+
+        Returns:
+            tuple: The files in load order, the shared namespace of their symbols and the
+                   files that had to be (re)loaded.
+        """
+        changed = {file_path for file_path in source_files if self._changed(file_path)}
+        ordered = resolve_dependencies(source_files, imports_of=lambda file: self.entries[file]["imports"])
+
+        # A module has to be re-executed when it or any module it imports was reloaded
+        dirty_stems = set()
+        reloaded = []
+        shared_namespace = {}
+        for file_path in ordered:
+            entry = self.entries[file_path]
+            if (file_path in changed or entry["module"] is None
+                    or dirty_stems.intersection(entry["imports"])):
+                entry["module"] = load_module(file_path, {}, out_console)
+                dirty_stems.add(file_path.stem)
+                reloaded.append(file_path)
+            shared_namespace.update(vars(entry["module"]))
+        return ordered, shared_namespace, reloaded
+
+    def constant_pools(self, source_files):
+        return {file_path.stem: self.entries[file_path]["constants"] for file_path in source_files}
+
+
+class StreamWriter:
+    """
+    File-like object forwarding everything written to it to the client as output messages.
+    """
+
+    encoding = "utf-8"
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.disconnected = False
+
+    def send(self, message):
+        if self.disconnected:
+            return
+        try:
+            self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away; the job finishes quietly and the daemon keeps serving
+            self.disconnected = True
+
+    def write(self, text):
+        if text:
+            self.send({"type": "output", "text": text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def run_job(job, cache):
+    """
+    Runs one generation job against the warm module cache. Must be called with stdout
+    redirected to the client.
+    """
+    out_console = Console()
+    source_files = [Path(file_path) for file_path in job["files"]]
+    ordered, shared_namespace, reloaded = cache.refresh(source_files, out_console)
+    out_console.print(
+        f"[bold blue]Reused {len(ordered) - len(reloaded)} warm module(s), loaded {len(reloaded)}[/bold blue]"
+    )
+
+    all_classes = [(name, obj) for name, obj in shared_namespace.items() if isinstance(obj, type)]
+    if not all_classes:
+        out_console.print("[bold red]No classes found in the source files.[/bold red]")
+        return
+
+    options = dict(JOB_DEFAULTS, **job)
+    constant_probability = options["constant_probability"]
+    constant_pools = cache.constant_pools(ordered) if constant_probability > 0 else None
+    strategy = None
+    if options["boundary_probability"] or options["mutation_probability"] or options["call_timeout"]:
+        strategy = ValueStrategy(ordered, options["boundary_probability"], options["mutation_probability"],
+                                 options["call_timeout"], options["max_string_length"])
+    test_results = randoop_test_generator(
+        all_classes, options["sequence_length"], constant_pools, constant_probability, options["async_timeout"],
+        purity=PurityOracle(all_classes) if options["purity_analysis"] else None,
+        contracts=ContractChecker(options["contract_interval"], strategy=strategy) if options["contract_interval"] else None,
+        strategy=strategy, window=options["window"],
+    )
+    print_results(test_results)
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        writer = StreamWriter(self.wfile)
+        try:
+            request = self.rfile.readline()
+            if not request.strip():
+                return  # A liveness probe, not a job
+            job = json.loads(request)
+            with redirect_stdout(writer):
+                run_job(job, self.server.cache)
+        except Exception as e:
+            console.print(f"[bold red]Job failed: {e!r}[/bold red]")
+            writer.send({"type": "done", "error": repr(e)})
+            return
+        writer.send({"type": "done"})
+
+
+class GenerationServer(socketserver.UnixStreamServer):
+    # Jobs share sys.modules and the global RNG, so they are served one at a time
+    def __init__(self, socket_path):
+        super().__init__(str(socket_path), JobHandler)
+        self.cache = ModuleCache()
+
+
+def serve_forever(socket_path):
+    """
+    Listens for generation jobs on a Unix socket until interrupted.
+    """
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            if probe.connect_ex(str(socket_path)) == 0:
+                console.print(f"[bold red]A daemon is already listening on {socket_path}[/bold red]")
+                return
+        socket_path.unlink()  # Left behind by a daemon that did not shut down cleanly
+    with GenerationServer(socket_path) as server:
+        console.print(f"[bold green]randoop-cli daemon listening on {socket_path}[/bold green]")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            console.print("[bold yellow]Shutting down daemon[/bold yellow]")
+        finally:
+            socket_path.unlink(missing_ok=True)
@@ -0,0 +1,119 @@
+import os
+import re
+
+# Variable parts of exception messages, replaced so that failures differing only in
+# the offending value end up in the same bucket.
+MESSAGE_PATTERNS = [
+    (re.compile(r"0x[0-9a-fA-F]+"), "<addr>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?"), "<num>"),
+]
+
+
+def message_template(message):
+    """
+    Replaces numbers, quoted strings and addresses of an exception message with placeholders.
+    """
+    for pattern, placeholder in MESSAGE_PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def raising_frame(exception):
+    """
+    Returns (file name, line number, function) of the frame that raised the exception.
+
+    Walks the traceback links directly: unlike `traceback.extract_tb`, this never reads
+    source lines, which matters since every duplicate failure is keyed as well.
+    """
+    tb = exception.__traceback__
+    if tb is None:
+        return None
+    while tb.tb_next is not None:
+        tb = tb.tb_next
+    code = tb.tb_frame.f_code
+    return os.path.basename(code.co_filename), tb.tb_lineno, code.co_name
+
+
+def input_size(args):
+    """
+    Orders failing inputs so the most readable one represents its bucket:
+    fewer arguments first, then the shortest rendering.
+    """
+    return len(args), len(repr(args))
+
+
+class ErrorBuckets:
+    """
+    Groups failing calls by exception type, message template and raising frame,
+    keeping a count and the smallest failing input of every group.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+
+    def __len__(self):
+        return len(self.buckets)
+
+    def add(self, cls_name, method_name, args, exception):
+        """
+        Records a failing call.
+
+        Returns:
+            bool: True if the failure opened a new bucket, False if it duplicates a known one.
+        """
+        message = str(exception) or type(exception).__name__
+        key = (
+            cls_name,
+            method_name,
+            type(exception).__name__,
+            message_template(message),
+            raising_frame(exception),
+        )
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = {
+                "count": 1,
+                "case": (cls_name, method_name, args, message),
+                "size": input_size(args),
+            }
+            return True
+
+        bucket["count"] += 1
+        # Rendering the arguments is only worth it when their count does not rule them out
+        if len(args) <= bucket["size"][0]:
+            size = input_size(args)
+            if size < bucket["size"]:
+                bucket["case"] = (cls_name, method_name, args, message)
+                bucket["size"] = size
+        return False
+
+    def merge(self, other):
+        """
+        Folds the buckets of another run (e.g. another shard) into this one.
+        """
+        for key, bucket in other.buckets.items():
+            mine = self.buckets.get(key)
+            if mine is None:
+                self.buckets[key] = dict(bucket)
+                continue
+            mine["count"] += bucket["count"]
+            if bucket["size"] < mine["size"]:
+                mine["case"] = bucket["case"]
+                mine["size"] = bucket["size"]
+
+    def cases(self):
+        """
+        Returns one representative (cls_name, method_name, args, message) tuple per bucket.
+        """
+        return [bucket["case"] for bucket in self.buckets.values()]
+
+    def summary(self):
+        """
+        Returns (count, representative case) pairs, most frequent failures first.
+        """
+        return sorted(
+            ((bucket["count"], bucket["case"]) for bucket in self.buckets.values()),
+            key=lambda item: item[0],
+            reverse=True,
+        )
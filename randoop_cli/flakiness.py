@@ -0,0 +1,115 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .replay import render_sequence, write_job, start_worker
+from .sequence_store import CapturedValue, value_type_name
+
+
+def recorded_outcome(result):
+    """
+    The outcome recorded at generation time, in the form replay workers report.
+    """
+    if result is None or (isinstance(result, (int, float, str)) and not isinstance(result, CapturedValue)):
+        return ["value", type(result).__name__, repr(result)]
+    return ["type", value_type_name(result), None]
+
+
+def replay_chunk(job_path, hash_seed, indices):
+    """
+    Runs one worker over a job file and collects the outcomes of its sequences.
+
+    Raises:
+        RuntimeError: If the worker exits with an error or does not replay every sequence
+                      of the job, e.g. because the target files cannot be loaded.
+    """
+    import json
+
+    with open(Path(job_path).with_suffix(".log"), "w+", encoding="utf-8") as log:
+        worker = start_worker(job_path, hash_seed=hash_seed, log=log)
+        outcomes = {}
+        for line in worker.stdout:
+            message = json.loads(line)
+            outcomes[message["index"]] = message["outcomes"]
+        status = worker.wait()
+        if status != 0 or any(index not in outcomes for index in indices):
+            log.seek(0)
+            output = log.read()[-2000:]
+            raise RuntimeError(
+                f"replay worker exited with status {status} after {len(outcomes)} of {len(indices)} "
+                f"sequence(s)" + (f":\n{output}" if output else "")
+            )
+    return outcomes
+
+
+def verify_sequences(tot_sequences, source_files, async_methods=None, runs=3, workers=None):
+    """
+    Replays every sequence `runs` times in worker processes, each run under its own
+    PYTHONHASHSEED and in its own shuffled order, and finds the assertions that would not
+    hold reliably.
+
+    Args:
+        tot_sequences (list): List of successful test sequences.
+        source_files (list): Target files, in load order.
+        async_methods (set): (class, method) pairs that are coroutines.
+        runs (int): Number of independent replays of every sequence.
+        workers (int): Number of worker processes to run at once (default: CPU count).
+
+    Returns:
+        dict: "unstable" maps sequence indices to {call index: "type" | "drop"}, telling which
+              assertions to downgrade to type checks or drop. "flaky" lists the sequences whose
+              replays disagree, "stale" those whose replays agree with each other but not with
+              the generation run, and "failing" those that raise on replay.
+
+    Raises:
+        RuntimeError: If a worker could not replay its sequences, since missing outcomes
+                      would otherwise look like results that changed.
+    """
+    async_methods = async_methods or set()
+    workers = workers or os.cpu_count() or 1
+    entries = [render_sequence(sequence, async_methods) for sequence in tot_sequences]
+    report = {"unstable": {}, "flaky": [], "stale": [], "failing": []}
+    if not entries or runs < 1:
+        return report
+
+    # Split every run into chunks so that all workers are busy at once
+    chunks_per_run = max(1, min(len(entries), workers // runs or 1))
+    chunk_size = -(-len(entries) // chunks_per_run)
+
+    observed = [{} for _ in range(runs)]
+    with tempfile.TemporaryDirectory(prefix="randoop-verify-") as temp_dir, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for run in range(runs):
+            for offset in range(0, len(entries), chunk_size):
+                job_path = Path(temp_dir) / f"run-{run}-{offset}.json"
+                write_job(job_path, source_files, entries[offset:offset + chunk_size], offset, order_seed=run)
+                indices = range(offset, min(offset + chunk_size, len(entries)))
+                futures.append((run, pool.submit(replay_chunk, job_path, run + 1, indices)))
+        for run, future in futures:
+            observed[run].update(future.result())
+
+    for index, sequence in enumerate(tot_sequences):
+        replays = [run_outcomes.get(index, []) for run_outcomes in observed]
+        if any(outcome and outcome[0] == "raise" for replay in replays for outcome in replay):
+            report["failing"].append(index)
+
+        actions = {}
+        disagree = False
+        for position, (_, _, _, result) in enumerate(sequence):
+            expected = recorded_outcome(result)
+            seen = [replay[position] if position < len(replay) else None for replay in replays]
+            if any(outcome != seen[0] for outcome in seen):
+                disagree = True
+            if all(outcome == expected for outcome in seen):
+                continue
+            if all(outcome is not None and outcome[0] != "raise" and outcome[1] == expected[1] for outcome in seen):
+                actions[position] = "type"
+            else:
+                actions[position] = "drop"
+
+        if actions:
+            report["unstable"][index] = actions
+            report["flaky" if disagree else "stale"].append(index)
+    return report
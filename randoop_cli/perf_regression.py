@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from rich.console import Console
+
+from .test_generator import class_name, format_args
+
+console = Console()
+
+PERF_TEST_FILE = "performance_regression_tests.py"
+BASELINE_FILE = "perf_baselines.json"
+
+PERF_TEST_IMPORTS = '''import asyncio
+import json
+import os
+import time
+from pathlib import Path
+'''
+
+PERF_TEST_HEADER = '''
+BASELINES = json.loads((Path(__file__).parent / {baseline_file!r}).read_text())
+FACTOR = float(os.environ.get("RANDOOP_PERF_FACTOR", BASELINES["factor"]))
+REPETITIONS = {repetitions}
+
+
+def measure(sequence, loops):
+    best = float("inf")
+    for _ in range(REPETITIONS):
+        started = time.perf_counter()
+        for _ in range(loops):
+            sequence()
+        best = min(best, (time.perf_counter() - started) / loops)
+    return best
+
+
+def check_budget(name, key, sequence):
+    baseline = BASELINES["baselines"][key]
+    budget = max(baseline["seconds"] * FACTOR, BASELINES["floor"])
+    elapsed = measure(sequence, baseline["loops"])
+    assert elapsed <= budget, (
+        f"{{name}} took {{elapsed * 1e6:.1f}} us, budget is {{budget * 1e6:.1f}} us "
+        f"(baseline {{baseline['seconds'] * 1e6:.1f}} us x {{FACTOR}})"
+    )
+
+'''
+
+
+def sequence_source(sequence, async_methods):
+    """
+    Renders a test sequence as the body of a `sequence()` function that replays its calls.
+    """
+    lines = ["def sequence():", f"    instance = {class_name(sequence[0][0])}()"]
+    for cls_name, method_name, args, _ in sequence:
+        call = f"instance.{method_name}({format_args(args)})"
+        if (cls_name, method_name) in async_methods:
+            call = f"asyncio.run({call})"
+        lines.append(f"    {call}")
+    return "\n".join(lines) + "\n"
+
+
+def autorange(sequence, min_sample=0.01):
+    """
+    Finds how many replays one timing sample needs to last at least `min_sample` seconds
+    (1, 2, 5, 10, 20, 50, ... like `timeit.Timer.autorange`), so microsecond-long
+    sequences are not timed at the resolution of the clock.
+    """
+    loops = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            number = loops * multiplier
+            started = time.perf_counter()
+            for _ in range(number):
+                sequence()
+            if time.perf_counter() - started >= min_sample:
+                return number
+        loops *= 10
+
+
+def measure_baseline(source, namespace, repetitions):
+    """
+    Replays a rendered sequence in `repetitions` auto-ranged samples and returns its best
+    time per replay, which is far less sensitive to scheduling noise than the mean.
+
+    Returns:
+        dict: "seconds" per replay and the number of "loops" per sample, which the
+              emitted test reuses so it measures the same way.
+    """
+    scope = dict(namespace)
+    exec(compile(source, "<perf-sequence>", "exec"), scope)
+    sequence = scope["sequence"]
+    loops = autorange(sequence)
+    best = float("inf")
+    for _ in range(repetitions):
+        started = time.perf_counter()
+        for _ in range(loops):
+            sequence()
+        best = min(best, (time.perf_counter() - started) / loops)
+    return {"seconds": best, "loops": loops}
+
+
+def write_performance_tests(tot_sequences, class_map, file_paths, async_methods=None, factor=3.0,
+                            repetitions=5, floor=1e-6, update_baselines=False):
+    """
+    Writes performance regression tests for the generated sequences together with a
+    side file holding the baseline latency of each of them.
+
+    Args:
+        tot_sequences (list): List of successful test sequences.
+        class_map (dict): Mapping of class keys to the loaded class objects.
+        file_paths (list): Paths to the files with class definitions.
+        async_methods (set): (class, method) pairs that are coroutines.
+        factor (float): How many times slower than its baseline a sequence may get before its test fails.
+        repetitions (int): Number of auto-ranged samples a latency is measured over (best of).
+        floor (float): Minimum budget in seconds per replay, so near-empty sequences do not fail on noise.
+        update_baselines (bool): Re-measure sequences that already have a recorded baseline.
+    """
+    async_methods = async_methods or set()
+    baseline_path = Path(BASELINE_FILE)
+    if baseline_path.exists() and not update_baselines:
+        baselines = json.loads(baseline_path.read_text())["baselines"]
+    else:
+        baselines = {}
+
+    namespace = {class_name(cls_name): cls for cls_name, cls in class_map.items()}
+    namespace["asyncio"] = asyncio
+
+    tests = []
+    recorded = {}
+    for id, sequence in enumerate(tot_sequences):
+        test_name = f"test_perf_{class_name(sequence[0][0])}_{sequence[0][1]}_{id}"
+        source = sequence_source(sequence, async_methods)
+        # Baselines are keyed by the replayed code, so a stale entry never times a different sequence
+        key = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+        if isinstance(baselines.get(key), dict):  # Bare floats are baselines of the single-run format
+            recorded[key] = baselines[key]
+        else:
+            try:
+                recorded[key] = measure_baseline(source, namespace, repetitions)
+            except Exception as e:
+                # Sequences that cannot be replayed from a default instance have no stable timing
+                console.print(f"[yellow]Skipping {test_name}: replay raised {e!r}[/yellow]")
+                continue
+        tests.append((test_name, key, source))
+
+    baseline_path.write_text(json.dumps(
+        {"factor": factor, "floor": floor, "baselines": recorded}, indent=2, sort_keys=True
+    ))
+
+    with open(PERF_TEST_FILE, "w") as f:
+        f.write(PERF_TEST_IMPORTS)
+        for file_path in file_paths:
+            f.write(f"from {Path(file_path).stem} import *\n")
+        f.write(PERF_TEST_HEADER.format(baseline_file=BASELINE_FILE, repetitions=repetitions))
+        for test_name, key, source in tests:
+            f.write(f"\ndef {test_name}():\n")
+            for line in source.splitlines():
+                f.write(f"    {line}\n")
+            f.write(f"    check_budget({test_name!r}, {key!r}, sequence)\n\n")
+
+    console.print(
+        f"[bold green]Performance regression tests written to {PERF_TEST_FILE} "
+        f"(baselines in {BASELINE_FILE})[/bold green]"
+    )
@@ -0,0 +1,130 @@
+import math
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+from rich.table import Table
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class MethodProfiler:
+    """
+    Records the wall time and the allocated memory of every call made during
+    random exploration, keyed by class and method name. Both are process-wide
+    measurements, so calls must not overlap: the generator runs the sequences of
+    async classes one at a time while profiling.
+    """
+
+    def __init__(self, track_allocations=True):
+        self.track_allocations = track_allocations
+        self.timings = defaultdict(list)
+        self.slowest = {}
+        self.heaviest = {}
+
+    def start(self):
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        if self.track_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def measure(self, cls_name, method_name, args):
+        """
+        Measures the enclosed call. Calls that raise are measured as well, since a
+        slow failure is still a hot spot.
+        """
+        key = (cls_name, method_name)
+        tracing = self.track_allocations and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings[key].append(elapsed)
+            if key not in self.slowest or elapsed > self.slowest[key][0]:
+                self.slowest[key] = (elapsed, list(args))
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                allocated = max(0, peak - baseline)
+                if key not in self.heaviest or allocated > self.heaviest[key][0]:
+                    self.heaviest[key] = (allocated, list(args))
+
+    def summary(self):
+        """
+        Returns one row per method with its latency distribution and worst-case inputs.
+
+        Returns:
+            list: Dictionaries with the class and method name, call count, p50/p95/max
+                  latency in seconds, the peak allocation in bytes and the arguments
+                  of the slowest and of the most allocation-heavy call.
+        """
+        rows = []
+        for (cls_name, method_name), timings in self.timings.items():
+            ordered = sorted(timings)
+            max_time, slowest_args = self.slowest[(cls_name, method_name)]
+            max_alloc, heaviest_args = self.heaviest.get((cls_name, method_name), (None, None))
+            rows.append({
+                "class": cls_name,
+                "method": method_name,
+                "calls": len(ordered),
+                "p50": percentile(ordered, 0.50),
+                "p95": percentile(ordered, 0.95),
+                "max": max_time,
+                "slowest_args": slowest_args,
+                "max_alloc": max_alloc,
+                "heaviest_args": heaviest_args,
+            })
+        return rows
+
+    def print_report(self, console, top=3):
+        """
+        Prints the slowest and the most allocation-heavy methods of every class.
+        """
+        by_class = defaultdict(list)
+        for row in self.summary():
+            by_class[row["class"]].append(row)
+
+        for cls_name, rows in by_class.items():
+            table = Table(title=f"Hot spots in {cls_name}")
+            table.add_column("Method")
+            table.add_column("Calls", justify="right")
+            table.add_column("p50 (ms)", justify="right")
+            table.add_column("p95 (ms)", justify="right")
+            table.add_column("max (ms)", justify="right")
+            table.add_column("Slowest args")
+            table.add_column("Peak alloc (KiB)", justify="right")
+            table.add_column("Heaviest args")
+
+            rows.sort(key=lambda row: row["max"], reverse=True)
+            slowest = rows[:top]
+            heaviest = sorted(
+                (row for row in rows if row["max_alloc"] is not None),
+                key=lambda row: row["max_alloc"], reverse=True,
+            )[:top]
+            for row in slowest + [row for row in heaviest if row not in slowest]:
+                table.add_row(
+                    row["method"],
+                    str(row["calls"]),
+                    f"{row['p50'] * 1000:.3f}",
+                    f"{row['p95'] * 1000:.3f}",
+                    f"{row['max'] * 1000:.3f}",
+                    repr(row["slowest_args"]),
+                    "-" if row["max_alloc"] is None else f"{row['max_alloc'] / 1024:.1f}",
+                    "-" if row["heaviest_args"] is None else repr(row["heaviest_args"]),
+                )
+            console.print(table)
@@ -0,0 +1,163 @@
+import ast
+import hashlib
+import inspect
+import pickle
+import textwrap
+from collections import OrderedDict
+
+# Methods that mutate the built-in container they are called on
+MUTATING_METHODS = {
+    "append", "extend", "insert", "remove", "pop", "popitem", "clear", "update",
+    "add", "discard", "setdefault", "sort", "reverse", "__setitem__", "__delitem__",
+}
+
+
+def rooted_at(node, name):
+    """
+    Checks whether an expression such as `self.a.b[0]` is rooted at the variable `name`.
+    """
+    while isinstance(node, (ast.Attribute, ast.Subscript, ast.Starred)):
+        node = node.value
+    return isinstance(node, ast.Name) and node.id == name
+
+
+def method_effects(function):
+    """
+    Scans a method body for writes to its receiver or to globals.
+
+    Returns:
+        tuple: Whether the method writes state directly, and the names of the other
+               methods it calls on its receiver.
+    """
+    if isinstance(function, ast.AsyncFunctionDef) or not function.args.args:
+        return True, set()
+    receiver = function.args.args[0].arg
+    called = set()
+
+    for node in ast.walk(function):
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            return True, called
+        if isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign, ast.Delete)):
+            targets = node.targets if isinstance(node, (ast.Assign, ast.Delete)) else [node.target]
+            for target in targets:
+                elements = target.elts if isinstance(target, (ast.Tuple, ast.List)) else [target]
+                if any(rooted_at(element, receiver) and not isinstance(element, ast.Name) for element in elements):
+                    return True, called
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Name) and func.id in ("setattr", "delattr") and node.args \
+                    and rooted_at(node.args[0], receiver):
+                return True, called
+            if isinstance(func, ast.Attribute) and rooted_at(func.value, receiver):
+                if isinstance(func.value, ast.Name):
+                    called.add(func.attr)  # self.method(...)
+                elif func.attr in MUTATING_METHODS:
+                    return True, called  # self.items.append(...)
+    return False, called
+
+
+def analyze_purity(cls):
+    """
+    Classifies the methods of a class from their source: a method is pure if it neither
+    stores into its receiver nor declares globals, and only calls pure methods of its receiver.
+
+    Returns:
+        dict: Mapping of method names to True (pure) or False (may have side effects).
+              Classes without retrievable source yield an empty mapping.
+    """
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(cls)))
+    except (OSError, TypeError, SyntaxError):
+        return {}
+
+    class_def = tree.body[0]
+    effects = {
+        node.name: method_effects(node)
+        for node in class_def.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+    purity = {name: not writes for name, (writes, _) in effects.items()}
+
+    # Propagate impurity through calls to other methods of the receiver until stable
+    changed = True
+    while changed:
+        changed = False
+        for name, (_, called) in effects.items():
+            if purity[name] and any(not purity.get(callee, True) for callee in called):
+                purity[name] = False
+                changed = True
+    return purity
+
+
+def fingerprint(value):
+    """
+    Snapshot of an object's state used to detect mutations, or None if it cannot be taken.
+    """
+    try:
+        return pickle.dumps(vars(value) if hasattr(value, "__dict__") else value,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+
+class PurityOracle:
+    """
+    Combines the static classification with a dynamic check: a method classified as pure
+    is demoted as soon as a call changes its receiver's fingerprint. Pure calls already
+    made on the same receiver state with the same arguments are remembered by a digest,
+    in an LRU of at most `max_calls` entries; their results are not kept.
+    """
+
+    def __init__(self, classes, max_calls=4096):
+        self.static = {str(cls): analyze_purity(cls) for _, cls in classes}
+        self.demoted = set()
+        self.max_calls = max_calls
+        self.seen = OrderedDict()  # Call digest -> None, least recently seen first
+        self.skipped = 0
+
+    def is_pure(self, cls_name, method_name):
+        return (self.static.get(cls_name, {}).get(method_name, False)
+                and (cls_name, method_name) not in self.demoted)
+
+    def call_key(self, cls_name, method_name, state, args):
+        """
+        Digest identifying a call, or None when the receiver or the arguments cannot be fingerprinted.
+        """
+        arguments = fingerprint(list(args))
+        if state is None or arguments is None:
+            return None
+        digest = hashlib.blake2b(f"{cls_name}.{method_name}".encode("utf-8"), digest_size=16)
+        digest.update(len(state).to_bytes(8, "little"))
+        digest.update(state)
+        digest.update(arguments)
+        return digest.digest()
+
+    def seen_before(self, key):
+        """
+        Checks whether a pure call with this key was already made.
+        """
+        if key is None or key not in self.seen:
+            return False
+        self.seen.move_to_end(key)
+        return True
+
+    def record(self, cls_name, method_name, state, after, key):
+        """
+        Checks the receiver fingerprint after a call and remembers the call if it is unchanged.
+        """
+        if state != after:
+            self.demoted.add((cls_name, method_name))
+            return
+        if key is not None:
+            self.seen[key] = None
+            self.seen.move_to_end(key)
+            if len(self.seen) > self.max_calls:
+                self.seen.popitem(last=False)
+
+    def pure_methods(self):
+        return sorted(
+            (cls_name, method_name)
+            for cls_name, methods in self.static.items()
+            for method_name, pure in methods.items()
+            if pure and not method_name.startswith("__") and (cls_name, method_name) not in self.demoted
+        )
@@ -0,0 +1,124 @@
+import asyncio
+import inspect
+import json
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+# Replays generated sequences in a separate interpreter the way the emitted tests run
+# them: on a fresh default instance, with arguments rebuilt from their source rendering.
+# Jobs and results are exchanged as JSON so no target object crosses process boundaries.
+
+
+def render_sequence(sequence, async_methods):
+    """
+    Renders a test sequence into a JSON-able replay job entry.
+    """
+    from .test_generator import class_name, format_args
+
+    return {
+        "cls_name": sequence[0][0],
+        "class": class_name(sequence[0][0]),
+        "calls": [
+            [method_name, format_args(args), (cls_name, method_name) in async_methods]
+            for cls_name, method_name, args, _ in sequence
+        ],
+    }
+
+
+def outcome_of(result):
+    """
+    What an emitted test can assert about a result: its type, plus its value for primitives.
+    """
+    from_value = result is None or isinstance(result, (int, float, str))
+    return ["value" if from_value else "type", type(result).__name__, repr(result) if from_value else None]
+
+
+def replay_sequence(entry, namespace):
+    """
+    Runs one rendered sequence and returns the outcome of each call. A call that raises
+    ends the sequence, as it would end the emitted test.
+    """
+    outcomes = []
+    try:
+        instance = eval(f"{entry['class']}()", namespace)
+    except Exception as e:
+        return [["raise", type(e).__name__, str(e)]]
+    for method_name, args_source, is_async in entry["calls"]:
+        try:
+            args = eval(f"({args_source},)", namespace) if args_source else ()
+            result = getattr(instance, method_name)(*args)
+            if is_async or inspect.isawaitable(result):
+                result = asyncio.run(result)
+        except Exception as e:
+            outcomes.append(["raise", type(e).__name__, str(e)])
+            break
+        outcomes.append(outcome_of(result))
+    return outcomes
+
+
+def run_worker(job_path):
+    """
+    Worker entry point: loads the target files, replays the job's sequences (shuffled
+    when the job carries an order seed) and streams one JSON line per sequence to stdout.
+    """
+    from rich.console import Console
+    from .module_loader import load_module
+
+    protocol = sys.stdout
+    sys.stdout = sys.stderr  # Whatever the target code prints must not corrupt the stream
+    with open(job_path, "r", encoding="utf-8") as f:
+        job = json.load(f)
+
+    namespace = {}
+    console = Console(stderr=True, quiet=True)
+    for file_path in job["source_files"]:
+        load_module(Path(file_path), namespace, console)
+
+    entries = list(enumerate(job["sequences"]))
+    if job.get("order_seed") is not None:
+        random.Random(job["order_seed"]).shuffle(entries)
+    for index, entry in entries:
+        outcomes = replay_sequence(entry, namespace)
+        protocol.write(json.dumps({"index": job["offset"] + index, "outcomes": outcomes}) + "\n")
+        protocol.flush()
+
+
+def start_worker(job_path, hash_seed=None, cwd=None, log=None):
+    """
+    Starts a replay worker process, optionally under a given PYTHONHASHSEED. The worker's
+    stderr, which also receives whatever the target code prints, goes to the `log` file
+    if one is given and is discarded otherwise.
+
+    Returns:
+        subprocess.Popen: The worker, whose stdout yields one JSON line per replayed sequence.
+    """
+    env = dict(os.environ)
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    if hash_seed is not None:
+        env["PYTHONHASHSEED"] = str(hash_seed)
+    return subprocess.Popen(
+        [sys.executable, "-m", "randoop_cli.replay", str(job_path)],
+        stdout=subprocess.PIPE,
+        stderr=log if log is not None else subprocess.DEVNULL,
+        text=True,
+        env=env,
+        cwd=cwd,
+    )
+
+
+def write_job(path, source_files, entries, offset=0, order_seed=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "source_files": [str(Path(file_path).resolve()) for file_path in source_files],
+            "sequences": entries,
+            "offset": offset,
+            "order_seed": order_seed,
+        }, f)
+
+
+if __name__ == "__main__":
+    run_worker(sys.argv[1])
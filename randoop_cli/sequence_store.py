@@ -0,0 +1,280 @@
+import mmap
+import pickle
+import struct
+import tempfile
+from array import array
+
+# One-byte tags of the encoded values
+NONE, TRUE, FALSE, INT, BIG_INT, FLOAT, STR, POOLED, CAPTURED = b"NTFiIdspr"
+
+INT64 = struct.Struct("<q")
+FLOAT64 = struct.Struct("<d")
+UINT32 = struct.Struct("<I")
+POOL_REF = struct.Struct("<II")
+
+
+class CapturedValue:
+    """
+    Stand-in for a recorded value that is neither a primitive nor a pooled instance:
+    only its type name and its repr at the time of the call are kept.
+    """
+
+    __slots__ = ("type_name", "text")
+
+    def __init__(self, type_name, text):
+        self.type_name = type_name
+        self.text = text
+
+    def __repr__(self):
+        return self.text
+
+    def __eq__(self, other):
+        return (isinstance(other, CapturedValue)
+                and (self.type_name, self.text) == (other.type_name, other.text))
+
+    def __hash__(self):
+        return hash((self.type_name, self.text))
+
+    def __getstate__(self):
+        return self.type_name, self.text
+
+    def __setstate__(self, state):
+        self.type_name, self.text = state
+
+
+def value_type_name(value):
+    """
+    Returns the class name of a recorded value, seeing through captured values.
+    """
+    if isinstance(value, CapturedValue):
+        return value.type_name
+    return value.__class__.__name__
+
+
+class SequenceStore:
+    """
+    List-like store of (cls_name, method_name, args, result) calls that does not keep
+    the recorded values alive.
+
+    Class/method pairs are interned into an integer table and every call is packed into
+    a byte buffer: primitives with `struct`, instances of the generator's pools as
+    (pool, index) references and any other value as a captured repr. Once the buffer
+    exceeds `memory_budget` bytes it is spilled to a temporary file, which is read back
+    through a memory map.
+    """
+
+    def __init__(self, pools=None, memory_budget=64 * 1024 * 1024):
+        self.pools = pools if pools is not None else {}
+        self.memory_budget = memory_budget
+        self.methods = []
+        self.method_ids = {}
+        self.pool_keys = []
+        self.pool_key_ids = {}
+        self.pool_positions = {}  # id(instance) -> (pool id, index), filled lazily
+        self.record_methods = array("I")
+        self.record_offsets = array("Q")
+        self.record_sequences = array("I")  # Sequence of each call within its class
+        self.buffer = bytearray()
+        self.spilled = 0
+        self.spill_file = None
+        self.spill_map = None
+
+    def __len__(self):
+        return len(self.record_methods)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sequence index out of range")
+
+        cls_name, method_name = self.methods[self.record_methods[index]]
+        source, position = self._locate(self.record_offsets[index])
+        (count,) = UINT32.unpack_from(source, position)
+        position += UINT32.size
+        args = []
+        for _ in range(count):
+            value, position = self._decode(source, position)
+            args.append(value)
+        result, _ = self._decode(source, position)
+        return cls_name, method_name, args, result
+
+    def sequence_of(self, index):
+        """
+        Returns the sequence number the call at `index` was recorded with.
+        """
+        return self.record_sequences[index]
+
+    def append(self, call, sequence=0):
+        cls_name, method_name, args, result = call
+        key = (cls_name, method_name)
+        method_id = self.method_ids.get(key)
+        if method_id is None:
+            method_id = self.method_ids[key] = len(self.methods)
+            self.methods.append(key)
+
+        self.record_methods.append(method_id)
+        self.record_offsets.append(self.spilled + len(self.buffer))
+        self.record_sequences.append(sequence)
+        self.buffer += UINT32.pack(len(args))
+        for arg in args:
+            self._encode(arg)
+        self._encode(result)
+        if len(self.buffer) >= self.memory_budget:
+            self._spill()
+
+    def extend(self, calls):
+        for call in calls:
+            self.append(call)
+
+    def _pool_reference(self, value):
+        pool_key = str(type(value))
+        pool = self.pools.get(pool_key)
+        if not pool:
+            return None
+        position = self.pool_positions.get(id(value))
+        if position is not None:
+            pool_id, index = position
+            if index < len(pool) and pool[index] is value:
+                return position
+        for index, instance in enumerate(pool):
+            if instance is value:
+                pool_id = self.pool_key_ids.get(pool_key)
+                if pool_id is None:
+                    pool_id = self.pool_key_ids[pool_key] = len(self.pool_keys)
+                    self.pool_keys.append(pool_key)
+                self.pool_positions[id(value)] = (pool_id, index)
+                return pool_id, index
+        return None
+
+    def _encode(self, value):
+        buffer = self.buffer
+        if value is None:
+            buffer.append(NONE)
+        elif value is True:
+            buffer.append(TRUE)
+        elif value is False:
+            buffer.append(FALSE)
+        elif type(value) is int:
+            if -2 ** 63 <= value < 2 ** 63:
+                buffer.append(INT)
+                buffer += INT64.pack(value)
+            else:
+                self._encode_text(BIG_INT, str(value))
+        elif type(value) is float:
+            buffer.append(FLOAT)
+            buffer += FLOAT64.pack(value)
+        elif type(value) is str:
+            self._encode_text(STR, value)
+        else:
+            reference = self._pool_reference(value)
+            if reference is not None:
+                buffer.append(POOLED)
+                buffer += POOL_REF.pack(*reference)
+            else:
+                try:
+                    text = repr(value)
+                except Exception as e:
+                    text = f"<unrepresentable {value_type_name(value)}: {e!r}>"
+                self._encode_text(CAPTURED, value_type_name(value))
+                self._encode_text(STR, text)
+
+    def _encode_text(self, tag, text):
+        data = text.encode("utf-8", "surrogatepass")
+        self.buffer.append(tag)
+        self.buffer += UINT32.pack(len(data)) + data
+
+    def _decode(self, source, position):
+        tag = source[position]
+        position += 1
+        if tag == NONE:
+            return None, position
+        if tag == TRUE:
+            return True, position
+        if tag == FALSE:
+            return False, position
+        if tag == INT:
+            return INT64.unpack_from(source, position)[0], position + INT64.size
+        if tag == FLOAT:
+            return FLOAT64.unpack_from(source, position)[0], position + FLOAT64.size
+        if tag == POOLED:
+            pool_id, index = POOL_REF.unpack_from(source, position)
+            return self.pools[self.pool_keys[pool_id]][index], position + POOL_REF.size
+        (length,) = UINT32.unpack_from(source, position)
+        position += UINT32.size
+        text = bytes(source[position:position + length]).decode("utf-8", "surrogatepass")
+        position += length
+        if tag == BIG_INT:
+            return int(text), position
+        if tag == STR:
+            return text, position
+        if tag == CAPTURED:
+            value_text, position = self._decode(source, position)
+            return CapturedValue(text, value_text), position
+        raise ValueError(f"Corrupt sequence store: unknown tag {tag!r}")
+
+    def _locate(self, offset):
+        if offset >= self.spilled:
+            return self.buffer, offset - self.spilled
+        if self.spill_map is None:
+            self.spill_map = mmap.mmap(self.spill_file.fileno(), self.spilled, access=mmap.ACCESS_READ)
+        return self.spill_map, offset
+
+    def _spill(self):
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile(prefix="randoop-sequences-")
+        if self.spill_map is not None:
+            self.spill_map.close()
+            self.spill_map = None
+        self.spill_file.seek(self.spilled)
+        self.spill_file.write(self.buffer)
+        self.spill_file.flush()
+        self.spilled += len(self.buffer)
+        self.buffer = bytearray()
+
+    def __getstate__(self):
+        # The spilled segment and the in-memory tail are handed to pickle as buffers, so
+        # `pickle.dump` to a file streams them out without copying the store in memory.
+        # Pickling therefore needs protocol 5 or higher.
+        spilled = b""
+        if self.spilled:
+            spill_map, _ = self._locate(0)
+            spilled = pickle.PickleBuffer(spill_map)
+        return {
+            "pools": self.pools,
+            "memory_budget": self.memory_budget,
+            "methods": self.methods,
+            "pool_keys": self.pool_keys,
+            "record_methods": pickle.PickleBuffer(self.record_methods),
+            "record_offsets": pickle.PickleBuffer(self.record_offsets),
+            "record_sequences": pickle.PickleBuffer(self.record_sequences),
+            "spilled": spilled,
+            "buffer": pickle.PickleBuffer(self.buffer),
+        }
+
+    def __setstate__(self, state):
+        self.__init__(state["pools"], state["memory_budget"])
+        self.methods = state["methods"]
+        self.method_ids = {key: method_id for method_id, key in enumerate(self.methods)}
+        self.pool_keys = state["pool_keys"]
+        self.pool_key_ids = {key: pool_id for pool_id, key in enumerate(self.pool_keys)}
+        self.record_methods.frombytes(state["record_methods"])
+        self.record_offsets.frombytes(state["record_offsets"])
+        if "record_sequences" in state:
+            self.record_sequences.frombytes(state["record_sequences"])
+        else:
+            self.record_sequences.extend(0 for _ in self.record_methods)  # Stores pickled before windows
+        if "data" in state:  # Stores pickled with the spilled segment folded into the buffer
+            self.buffer = bytearray(state["data"])
+            return
+        if state["spilled"]:
+            # Back to a spill file, so a loaded store stays within its memory budget as well
+            self.buffer = state["spilled"]
+            self._spill()
+        self.buffer = bytearray(state["buffer"])
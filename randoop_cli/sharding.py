@@ -0,0 +1,207 @@
+import hashlib
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+from .checkpoint import dump_with_fallback, picklable_error_buckets, picklable_sequences
+from .error_buckets import ErrorBuckets
+from .module_loader import load_module
+from .sequence_store import SequenceStore
+
+SHARD_FORMAT = 2
+
+
+def parse_shard(text):
+    """
+    Parses a shard specification such as "3/16" into a (index, count) pair, index being 1-based.
+    """
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {text!r}, expected INDEX/COUNT such as 3/16")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {text!r}, INDEX must be between 1 and COUNT")
+    return index, count
+
+
+def qualified_class_name(cls):
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def in_shard(cls, shard):
+    """
+    Assigns classes to shards by a stable hash of their qualified name, so every machine
+    computes the same partition without coordinating.
+    """
+    index, count = shard
+    digest = hashlib.sha1(qualified_class_name(cls).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count == index - 1
+
+
+def read_sources(source_files):
+    """
+    Reads the target files into a mapping of module names to source, in load order.
+    """
+    return {Path(file_path).stem: Path(file_path).read_text(encoding="utf-8") for file_path in source_files}
+
+
+def write_shard_result(path, shard, sources, test_results, coverage_lines):
+    """
+    Writes a self-contained result file for one shard: the source of the target files,
+    the generated sequences, the error buckets and the lines covered.
+
+    The objects recorded in the sequences are pickled after a header holding the sources,
+    so that `load_shard_results` can first load the target modules their classes live in.
+    `test_results["sequences"]` holds either the calls of a generation run, in a
+    `SequenceStore`, or the list of sequences of a merged corpus. A merged corpus is
+    stored as one flat store plus the index where each sequence starts.
+    """
+    sequences = test_results["sequences"]
+    boundaries = None
+    if not isinstance(sequences, SequenceStore):
+        boundaries = []
+        store = SequenceStore()
+        for sequence in sequences:
+            boundaries.append(len(store))
+            for call in sequence:
+                store.append(call)
+        sequences = store
+    payload = {
+        "sequences": sequences,
+        "boundaries": boundaries,
+        "error_buckets": picklable_error_buckets(test_results["error_buckets"]),
+        "async_methods": test_results["async_methods"],
+    }
+
+    with open(path, "wb") as f:
+        pickle.dump({
+            "format": SHARD_FORMAT,
+            "shard": shard,
+            "sources": sources,
+            "load_order": list(sources),
+            "coverage": coverage_lines,
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # The payload follows the header, streamed into the file without an in-memory copy
+        dump_with_fallback(payload, f, lambda payload: dict(
+            payload, sequences=picklable_sequences(payload["sequences"], payload["sequences"].pools)
+        ))
+
+
+def load_shard_results(paths, console):
+    """
+    Reads shard result files. The target modules embedded in the first file that carries
+    them are loaded before the recorded objects are unpickled.
+
+    Returns:
+        list: One dictionary per shard with its sequences, error buckets, coverage and shard spec.
+    """
+    headers = []
+    for path in paths:
+        with open(path, "rb") as f:
+            header = pickle.load(f)
+            header["payload_offset"] = f.tell()
+        if header.get("format") not in (1, SHARD_FORMAT):
+            raise ValueError(f"{path} is not a randoop-cli shard result")
+        headers.append(header)
+
+    sources = {}
+    load_order = []
+    for header in headers:
+        for stem in header["load_order"]:
+            text = header["sources"][stem]
+            if stem not in sources:
+                sources[stem] = text
+                load_order.append(stem)
+            elif sources[stem] != text:
+                console.print(f"[bold yellow]Shards were generated from different versions of {stem}[/bold yellow]")
+
+    source_dir = Path(tempfile.mkdtemp(prefix="randoop-merge-"))
+    try:
+        for stem in load_order:
+            file_path = source_dir / f"{stem}.py"
+            file_path.write_text(sources[stem], encoding="utf-8")
+            load_module(file_path, {}, console)
+    finally:
+        shutil.rmtree(source_dir)
+
+    results = []
+    for path, header in zip(paths, headers):
+        offset = header.pop("payload_offset")
+        if header["format"] == 1:  # The payload was pickled into the header
+            result = pickle.loads(header.pop("payload"))
+        else:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                result = pickle.load(f)
+        result.update(header, path=path)
+        results.append(result)
+    return results
+
+
+def split_sequences(result):
+    """
+    Returns the test sequences of a loaded result file: the sequences of a merged corpus
+    as they were merged, or one sequence per class for the calls of a generation run.
+    """
+    from .test_generator import group_sequences
+
+    boundaries = result.get("boundaries")
+    if boundaries is None:
+        return group_sequences(result["sequences"])
+    ends = boundaries[1:] + [len(result["sequences"])]
+    return [result["sequences"][start:end] for start, end in zip(boundaries, ends)]
+
+
+def sequence_key(sequence):
+    """
+    Identifies a sequence by the test it renders to, so that a sequence recorded with live
+    objects and its copy with captured values (as read back from a merged file) are equal.
+    """
+    from .flakiness import recorded_outcome
+    from .test_generator import format_args
+
+    return repr([
+        (cls_name, method_name, format_args(args), recorded_outcome(result))
+        for cls_name, method_name, args, result in sequence
+    ])
+
+
+def merge_shard_results(results):
+    """
+    Combines shard results into one corpus. Sequences recorded by more than one shard
+    (e.g. a shard that was re-run) are kept once, error buckets are folded together and
+    covered lines are united. Sequences stay separate even when they drive the same
+    class, since each was recorded on its own instance.
+
+    Returns:
+        dict: The merged result, whose "sequences" is a list of test sequences.
+    """
+    seen = set()
+    sources = {}
+    sequences = []
+    error_buckets = ErrorBuckets()
+    async_methods = set()
+    coverage_lines = {}
+    for result in results:
+        for stem in result["load_order"]:
+            sources.setdefault(stem, result["sources"][stem])
+        for sequence in split_sequences(result):
+            key = sequence_key(sequence)
+            if key not in seen:
+                seen.add(key)
+                sequences.append(sequence)
+        error_buckets.merge(result["error_buckets"])
+        async_methods.update(result["async_methods"])
+        for stem, lines in result["coverage"].items():
+            coverage_lines.setdefault(stem, set()).update(lines)
+
+    return {
+        "sequences": sequences,
+        "error_cases": error_buckets.cases(),
+        "error_buckets": error_buckets,
+        "async_methods": async_methods,
+        "coverage": {stem: sorted(lines) for stem, lines in coverage_lines.items()},
+        "shards": sorted(result["shard"] for result in results if result["shard"]),
+        "sources": sources,
+    }
@@ -0,0 +1,84 @@
+import pickle
+from array import array
+
+# Helpers written into the head of a test file using snapshot oracles. The snapshot is
+# loaded once, on first use, and numeric results are compared in bulk with a tolerance,
+# vectorized with NumPy when it is installed.
+SNAPSHOT_HEADER = '''import math
+import pickle
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SNAPSHOT_FILE = Path(__file__).with_name({snapshot_name!r})
+
+
+@lru_cache(maxsize=None)
+def load_snapshot():
+    with open(SNAPSHOT_FILE, "rb") as f:
+        return pickle.load(f)
+
+
+def check_snapshot(name, numeric, other):
+    snapshot = load_snapshot()
+    expected = snapshot["tests"][name]
+    rtol, atol = snapshot["rtol"], snapshot["atol"]
+    assert len(numeric) == expected["count"], f"{{name}}: expected {{expected['count']}} numeric results"
+    if numpy is not None:
+        expected_numeric = numpy.frombuffer(expected["numeric"], dtype=numpy.float64)
+        close = numpy.isclose(numpy.asarray(numeric, dtype=numpy.float64), expected_numeric,
+                              rtol=rtol, atol=atol, equal_nan=True)
+        mismatches = numpy.flatnonzero(~close).tolist()
+    else:
+        expected_numeric = array("d")
+        expected_numeric.frombytes(expected["numeric"])
+        mismatches = [
+            index for index, (actual, wanted) in enumerate(zip(numeric, expected_numeric))
+            if not (math.isclose(actual, wanted, rel_tol=rtol, abs_tol=atol)
+                    or (math.isnan(actual) and math.isnan(wanted)))
+        ]
+    assert not mismatches, f"{{name}}: numeric results {{mismatches}} differ from the snapshot"
+    assert other == expected["other"], f"{{name}}: results differ from the snapshot"
+
+'''
+
+
+def is_numeric(value):
+    """
+    Numbers compared with a tolerance. Only floats: ints are compared exactly, since a
+    tolerance would accept an off-by-one result for any large enough int.
+    """
+    return type(value) is float
+
+
+def is_exact(value):
+    """
+    Results stored in the snapshot and compared exactly.
+    """
+    return value is None or type(value) in (bool, str, int)
+
+
+def write_snapshot(path, tests, rtol, atol):
+    """
+    Writes the expected results of every test to a binary snapshot file.
+
+    Args:
+        path (Path): Snapshot file to write.
+        tests (dict): Mapping of test names to (numeric results, other results) lists.
+        rtol (float): Relative tolerance of numeric comparisons.
+        atol (float): Absolute tolerance of numeric comparisons.
+    """
+    snapshot = {"rtol": rtol, "atol": atol, "tests": {}}
+    for name, (numeric, other) in tests.items():
+        snapshot["tests"][name] = {
+            "count": len(numeric),
+            "numeric": array("d", numeric).tobytes(),
+            "other": other,
+        }
+    with open(path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,230 @@
+import math
+import random
+import signal
+import sys
+import threading
+import typing
+from contextlib import contextmanager
+from pathlib import Path
+
+# Returned by ValueStrategy.draw when the strategy leaves the choice to the random generator
+NO_VALUE = object()
+
+CONTAINER_TYPES = (list, dict, set, frozenset, tuple)
+
+# Seconds between repeated timeouts of a call that swallowed the first one
+TIMEOUT_REPEAT = 0.05
+
+
+class CallTimeout(BaseException):
+    """
+    A call exceeded the per-call time budget of the generator.
+
+    Derived from BaseException so that an `except Exception:` in the code under test
+    does not swallow it; callers of `ValueStrategy.guard` must catch it explicitly.
+    """
+
+
+def container_type(param_type):
+    """
+    Returns the container class of an annotation such as `list` or `dict[str, int]`, or None.
+    """
+    origin = typing.get_origin(param_type) or param_type
+    return origin if origin in CONTAINER_TYPES else None
+
+
+def boundary_values(param_type, max_length, max_int):
+    """
+    Extreme and edge-case values of a primitive or container type, within the work caps.
+    """
+    if param_type is bool:
+        return [True, False]
+    if param_type is int:
+        candidates = [0, 1, -1, 2, -2, 255, 256, 2 ** 31 - 1, -2 ** 31, 2 ** 63 - 1, -2 ** 63,
+                      sys.maxsize, -sys.maxsize - 1]
+        return [value for value in candidates if abs(value) <= max_int] + [max_int, -max_int]
+    if param_type is float:
+        return [0.0, -0.0, 1.0, -1.0, 0.1, sys.float_info.max, -sys.float_info.max, sys.float_info.min,
+                sys.float_info.epsilon, math.inf, -math.inf, math.nan]
+    if param_type is str:
+        return ["", " ", "0", "-1", "\x00", "é", "\u202e", "a" * max_length]
+    container = container_type(param_type)
+    if container is not None:
+        return [container()]
+    return []
+
+
+def clamp(value, max_length, max_int):
+    if type(value) is int:
+        return max(-max_int, min(max_int, value))
+    if type(value) is str:
+        return value[:max_length]
+    return value
+
+
+def mutate_value(value, max_length, max_int):
+    """
+    Returns a small variation of a primitive value of the same type; other values are kept.
+    """
+    if type(value) is bool:
+        return not value
+    if type(value) is int:
+        value = random.choice([
+            value + 1, value - 1, value + random.randint(-16, 16), -value, value * 2, value // 2, value ^ 1,
+        ])
+    elif type(value) is float:
+        if not math.isfinite(value):
+            return random.choice([0.0, sys.float_info.max, -sys.float_info.max])
+        value = random.choice([
+            value + 1.0, value - 1.0, -value, value * 2.0, value / 2.0,
+            math.nextafter(value, math.inf), math.nextafter(value, -math.inf),
+        ])
+    elif type(value) is str:
+        position = random.randint(0, len(value))
+        character = random.choice(["a", "Z", "0", " ", "\x00", "é"])
+        value = random.choice([
+            value[:position] + character + value[position:],
+            value[:position] + value[position + 1:],
+            value * 2,
+        ])
+    return clamp(value, max_length, max_int)
+
+
+class ArcTracer:
+    """
+    `sys.settrace` hook recording the (previous line, line) arcs executed in the target files.
+    Frames of other files are not traced line by line.
+    """
+
+    def __init__(self, source_files):
+        self.files = {str(Path(file_path).resolve()) for file_path in source_files}
+        self.targets = {}  # co_filename -> whether it is a target file
+        self.arcs = set()
+
+    def is_target(self, filename):
+        target = self.targets.get(filename)
+        if target is None:
+            target = self.targets[filename] = str(Path(filename).resolve()) in self.files
+        return target
+
+    def __call__(self, frame, event, arg):
+        code = frame.f_code
+        if not self.is_target(code.co_filename):
+            return None
+        last = -code.co_firstlineno
+        arcs = self.arcs
+
+        def trace_lines(frame, event, arg):
+            nonlocal last
+            if event == "line":
+                arcs.add((code, last, frame.f_lineno))
+                last = frame.f_lineno
+            elif event == "return":
+                arcs.add((code, last, -code.co_firstlineno))
+            return trace_lines
+
+        return trace_lines
+
+
+class ValueStrategy:
+    """
+    Strategy layer on top of the uniform random values of the generator: mixes in boundary
+    values, mutates the arguments of calls that reached new branches, and caps the work
+    of every call.
+
+    Args:
+        source_files (list): Target files whose branches guide the mutational search.
+        boundary_probability (float): Chance of drawing a boundary value (or a mined constant).
+        mutation_probability (float): Chance of mutating the arguments of an earlier call of the
+                                      same method that reached new branches.
+        call_timeout (float): Seconds a call may run before it is interrupted (0 disables).
+        max_length (int): Longest string generated.
+        max_int (int): Largest integer magnitude generated.
+    """
+
+    def __init__(self, source_files, boundary_probability=0.1, mutation_probability=0.2, call_timeout=2.0,
+                 max_length=10000, max_int=sys.maxsize, max_seeds=32):
+        self.boundary_probability = boundary_probability
+        self.mutation_probability = mutation_probability
+        self.call_timeout = call_timeout
+        self.max_length = max_length
+        self.max_int = max_int
+        self.max_seeds = max_seeds
+        self.tracer = ArcTracer(source_files) if mutation_probability > 0 else None
+        self.seeds = {}  # (class, method) -> argument lists that reached new branches
+        self.mutated = 0
+        self.timeouts = 0
+        self._armed = False
+
+    def draw(self, param_type, constants=None):
+        """
+        Returns a boundary value (or a mined constant) for the type, or NO_VALUE.
+        Container types, which the random generator cannot build, always get a value.
+        """
+        container = container_type(param_type)
+        if container is None and random.random() >= self.boundary_probability:
+            return NO_VALUE
+        candidates = boundary_values(param_type, self.max_length, self.max_int)
+        candidates += (constants or {}).get(param_type, [])
+        if not candidates:
+            return NO_VALUE
+        return clamp(random.choice(candidates), self.max_length, self.max_int)
+
+    def propose(self, cls_name, method_name, args):
+        """
+        Returns a mutation of a seed of the method with the given chance, or `args` unchanged.
+        """
+        seeds = self.seeds.get((cls_name, method_name))
+        if not seeds or random.random() >= self.mutation_probability:
+            return args
+        self.mutated += 1
+        seed = random.choice(seeds)
+        return [
+            mutate_value(value, self.max_length, self.max_int) if random.random() < 0.5 else value
+            for value in seed
+        ]
+
+    def _timeout(self, signum, frame):
+        if self._armed:  # The guard may already be unwinding
+            raise CallTimeout(f"call exceeded the {self.call_timeout}s budget")
+
+    @contextmanager
+    def guard(self, cls_name, method_name, args, trace=True):
+        """
+        Runs a call under the time budget, keeping its arguments as a seed if it reached
+        new branches. Branches are not traced while another tracer (e.g. coverage) is active,
+        and the time budget needs SIGALRM and the main thread. Only guard synchronous code:
+        the timer and the tracer are process-wide, so they must not stay armed while an
+        event loop waits or runs other tasks.
+
+        Once the budget is spent the timer keeps firing every `TIMEOUT_REPEAT` seconds
+        until the call returns, in case the code under test catches the timeout.
+        """
+        tracing = trace and self.tracer is not None and sys.gettrace() is None
+        timed = (self.call_timeout > 0 and hasattr(signal, "setitimer")
+                 and threading.current_thread() is threading.main_thread())
+        known_arcs = len(self.tracer.arcs) if tracing else 0
+        if timed:
+            previous_handler = signal.signal(signal.SIGALRM, self._timeout)
+            self._armed = True
+            signal.setitimer(signal.ITIMER_REAL, self.call_timeout, TIMEOUT_REPEAT)
+        if tracing:
+            sys.settrace(self.tracer)
+        try:
+            yield
+        except CallTimeout:
+            self.timeouts += 1
+            raise
+        finally:
+            if timed:
+                self._armed = False
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+            if tracing:
+                sys.settrace(None)
+            if tracing and len(self.tracer.arcs) > known_arcs:
+                seeds = self.seeds.setdefault((cls_name, method_name), [])
+                if len(seeds) < self.max_seeds:
+                    seeds.append(list(args))
+                else:
+                    seeds[random.randrange(self.max_seeds)] = list(args)
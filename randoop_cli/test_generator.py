@@ -1,18 +1,36 @@
 import inspect
+import math
 import random
+from contextlib import nullcontext
 from .data_generation import generate_random_primitive
-from .coverage_analysis import print_coverage
+from .constant_mining import constants_for_class
+from .error_buckets import ErrorBuckets
+from .checkpoint import save_checkpoint
+from .sharding import in_shard
+from .sequence_store import SequenceStore, value_type_name
+from .purity import fingerprint
+from .snapshot_oracle import SNAPSHOT_HEADER, is_numeric, is_exact, write_snapshot
+from .strategies import NO_VALUE, CallTimeout
+from .async_support import is_async_class, await_with_timeout, run_awaitable, run_concurrently
 from pathlib import Path
 import string
+import time
 from rich.console import Console
-from rich.progress import Progress
 
 console = Console()
 
 
 # Generate random primitive values or instances for non-primitive types
-def generate_random_value(param_type, class_map, storage):
+def generate_random_value(param_type, class_map, storage, constants=None, constant_probability=0.0, history=None,
+                          strategy=None):
     qualified_type_name = str(param_type)
+    if constants and constants.get(param_type) and random.random() < constant_probability:
+        # Literals mined from the target source reach branches guarded by specific values
+        return random.choice(constants[param_type])
+    if strategy is not None:
+        value = strategy.draw(param_type, constants)
+        if value is not NO_VALUE:
+            return value
     if param_type == int:
         return random.randint(-100, 100)
     elif param_type == float:
@@ -23,7 +41,10 @@ def generate_random_value(param_type, class_map, storage):
         return random.choice([True, False])
     elif qualified_type_name in class_map:
         if qualified_type_name not in storage or not storage[qualified_type_name]:
-            instance = create_instance(class_map[qualified_type_name], class_map, storage)
+            instance = create_instance(
+                class_map[qualified_type_name], class_map, storage, constants, constant_probability, history,
+                strategy,
+            )
             if instance:
                 storage[qualified_type_name].append(instance)
         return random.choice(storage[qualified_type_name])
@@ -33,7 +54,8 @@ def generate_random_value(param_type, class_map, storage):
 
 
 # Create an instance of a class with random arguments
-def create_instance(cls, class_map, storage):
+def create_instance(cls, class_map, storage, constants=None, constant_probability=0.0, history=None,
+                    strategy=None):
     """
     Generates a storage data structure for the provided classes.
     The storage contains:
@@ -42,6 +64,11 @@ def create_instance(cls, class_map, storage):
 
     Args:
         classes (list): A list of tuples where each tuple contains a class name and its corresponding class object.
+        constants (dict): Literals mined from the target source, bucketed by type.
+        constant_probability (float): Chance of drawing an argument from `constants`.
+        history (dict): If given, records (class, constructor args, calls) under the id of the
+                        new instance, so contract violations can be traced back to their calls.
+        strategy (ValueStrategy): Optional source of boundary values mixed into the random ones.
 
     Returns:
         dict: A dictionary with class names as keys and their respective metadata as values.
@@ -51,14 +78,18 @@ def create_instance(cls, class_map, storage):
     args = []
 
     for param_name, param in signature.parameters.items():
-        if param_name == "self":
+        if param_name == "self" or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
             continue
         param_type = param.annotation if param.annotation != inspect.Parameter.empty else str
-        args.append(generate_random_value(param_type, class_map, storage))
+        args.append(generate_random_value(
+            param_type, class_map, storage, constants, constant_probability, history, strategy
+        ))
 
     try:
         instance = cls(*args)
         print("Created instance of", qualified_cls_name, "with args:", args)
+        if history is not None:
+            history[id(instance)] = (cls, args, [])
         return instance
     except Exception as e:
         print("Could not create instance of", qualified_cls_name, ":", e, "\n")
@@ -66,7 +97,8 @@ def create_instance(cls, class_map, storage):
 
 
 # Invoke a random method with random arguments on a class instance
-def invoke_random_method(instance, class_map, storage):
+def invoke_random_method(instance, class_map, storage, constants=None, constant_probability=0.0, history=None,
+                         strategy=None):
     methods = [
         m for m in dir(instance)
         if callable(getattr(instance, m)) and not m.startswith("__")
@@ -85,7 +117,9 @@ def invoke_random_method(instance, class_map, storage):
         if param_name == "self":
             continue
         param_type = param.annotation if param.annotation != inspect.Parameter.empty else str
-        args.append(generate_random_value(param_type, class_map, storage))
+        args.append(generate_random_value(
+            param_type, class_map, storage, constants, constant_probability, history, strategy
+        ))
 
     return_type = signature.return_annotation if signature.return_annotation != inspect.Signature.empty else None
     print("Preparing to call method:", method_name, "with args:", args)
@@ -93,83 +127,492 @@ def invoke_random_method(instance, class_map, storage):
 
 
 # Generate random tests for classes with multiple method calls per instance
-def randoop_test_generator(classes, sequence_number):
+def randoop_test_generator(classes, sequence_number, constant_pools=None, constant_probability=0.0,
+                           async_timeout=5.0, profiler=None, checkpoint=None, checkpoint_interval=60.0,
+                           resume_state=None, shard=None, memory_budget=64 * 1024 * 1024, purity=None,
+                           contracts=None, strategy=None, window=0):
+    from rich.progress import Progress
+
     class_map = {str(cls): cls for _, cls in classes}
+    class_constants = {str(cls): constants_for_class(cls, constant_pools) for _, cls in classes}
     storage = {str(cls): [] for _, cls in classes}
-    sequences = []
-    error_prone_cases = []
+    sequences = SequenceStore(storage, memory_budget)
+    error_buckets = ErrorBuckets()
+    async_methods = set()
+    completed = {str(cls): 0 for _, cls in classes}  # Method invocations done per class
+    instances = {}  # Instance each class sequence is driven on
+    if resume_state:
+        for cls_name, pooled in resume_state["storage"].items():
+            if cls_name in storage:
+                storage[cls_name] = pooled
+        sequences = resume_state["sequences"]
+        if isinstance(sequences, SequenceStore):
+            sequences.pools = storage  # Later calls refer to the live pools, not the unpickled copy
+        error_buckets = resume_state["error_buckets"]
+        async_methods = resume_state["async_methods"]
+        completed.update((k, v) for k, v in resume_state["completed"].items() if k in completed)
+        instances = resume_state["instances"]
+        random.setstate(resume_state["random_state"])
+        print("-----> Resuming from checkpoint with", len(sequences), "recorded calls")
+    history = contracts.history if contracts is not None else None
     print("-----> Pre-Creating the Instances for all Classes:")
     # Pre-create instances for all classes
     for cls_name, cls in class_map.items():
         if not storage[cls_name]:
-            instance = create_instance(cls, class_map, storage)
+            instance = create_instance(cls, class_map, storage, class_constants[cls_name], constant_probability,
+                                       history, strategy)
             if instance:
                 storage[cls_name].append(instance)
 
-    with Progress(console=console) as progress:
-        # Set up a progress bar for sequence generation
-        task = progress.add_task("[cyan]Generating sequences...", total=sequence_number)
-        # For each class, perform multiple method calls on the same instance
-        for cls_name, cls in class_map.items():
-            if storage[cls_name]:
-                instance = random.choice(storage[str(cls)])
-                print("\n-----> Using instance of", cls_name, ":", instance)
-
-                for _ in range(sequence_number):  # Number of method invocations per instance
-                    method_name, method, args, return_type = None, None, None, None
-                    console.log(f"[green]Processing:[/] {cls_name}.{method_name}({args})")
-                    try:
-                        result = invoke_random_method(instance, class_map, storage)
-                        if result is None:
+    def sequence_number_of(cls_name):
+        # With a window, every `window` calls of a class form their own sequence
+        return completed[cls_name] // window if window else 0
+
+    def next_instance(cls_name, instance, current):
+        # A call that starts a new window is driven on a fresh instance
+        if sequence_number_of(cls_name) == current:
+            return instance
+        fresh = create_instance(class_map[cls_name], class_map, storage, class_constants[cls_name],
+                                constant_probability, history, strategy)
+        if not fresh:
+            return instance
+        storage[cls_name].append(fresh)
+        instances[cls_name] = fresh
+        return fresh
+
+    def generator_state():
+        return {
+            "random_state": random.getstate(),
+            "storage": storage,
+            "sequences": sequences,
+            "error_buckets": error_buckets,
+            "async_methods": async_methods,
+            "completed": completed,
+            "instances": instances,
+        }
+
+    last_checkpoint = time.monotonic()
+
+    def finish_step(cls_name, progress, task):
+        nonlocal last_checkpoint
+        completed[cls_name] += 1
+        progress.update(task, advance=1)  # Update progress
+        if contracts is not None and contracts.due():
+            contracts.check(storage, error_buckets)
+        if checkpoint and time.monotonic() - last_checkpoint >= checkpoint_interval:
+            save_checkpoint(checkpoint, generator_state())
+            last_checkpoint = time.monotonic()
+
+    def measure(cls_name, method_name, args):
+        if profiler is None:
+            return nullcontext()
+        return profiler.measure(cls_name, method_name, args)
+
+    def guard(cls_name, method_name, args):
+        if strategy is None:
+            return nullcontext()
+        # The branch tracer would inflate the profiled latencies
+        return strategy.guard(cls_name, method_name, args, trace=profiler is None)
+
+    def prepare_call(cls_name, instance):
+        console.log(f"[green]Processing:[/] {cls_name}")
+        call = invoke_random_method(instance, class_map, storage, class_constants[cls_name], constant_probability,
+                                    history, strategy)
+        if call is not None and strategy is not None:
+            # Explore around arguments that reached new branches of the method before
+            method_name, method, args, return_type = call
+            call = method_name, method, strategy.propose(cls_name, method_name, args), return_type
+        return call
+
+    def record_result(cls_name, method_name, args, result, return_type):
+        print("Called", cls_name + "." + method_name, "(", args, ") ->", result)
+        sequences.append((cls_name, method_name, args, result), sequence_number_of(cls_name))
+
+        if return_type and str(return_type) in class_map:
+            storage[str(return_type)].append(result)
+
+    def record_error(cls_name, method_name, args, e):
+        # Only the first failure of a bucket is worth reporting; duplicates are just counted
+        if error_buckets.add(cls_name, method_name, args, e):
+            print(cls_name + "." + str(method_name), "(", args, ") raised an exception:", e, "\n")
+
+    def run_sequence(cls_name, instance, progress, task):
+        pure_skips = 0
+        current = sequence_number_of(cls_name)
+        while completed[cls_name] < sequence_number:  # Number of method invocations per class
+            instance = next_instance(cls_name, instance, current)
+            current = sequence_number_of(cls_name)
+            method_name, args = None, None
+            try:
+                call = prepare_call(cls_name, instance)
+                if call is not None:
+                    method_name, method, args, return_type = call
+                    check_purity = purity is not None and purity.is_pure(cls_name, method_name)
+                    if check_purity:
+                        state = fingerprint(instance)
+                        key = purity.call_key(cls_name, method_name, state, args)
+                        if purity.seen_before(key) and pure_skips < sequence_number * 10:
+                            # A repeated pure call on an unchanged receiver adds nothing to the sequence
+                            pure_skips += 1
+                            purity.skipped += 1
                             continue
-                        method_name, method, args, return_type = result
-                        result = method(*args)  # Invoke the method
-                        print("Called", cls_name + "." + method_name, "(", args, ") ->", result)
-                        sequences.append((cls_name, method_name, args, result))
-
-                        if return_type and str(return_type) in class_map:
-                            storage[str(return_type)].append(result)
-                    except Exception as e:
-                        print(cls_name + "." + method_name, "(", args, ") raised an exception:", e, "\n")
-                        error_prone_cases.append((cls_name, method_name, args, str(e)))
-                    progress.update(task, advance=1)  # Update progress
+                    if contracts is not None:
+                        contracts.record_call(instance, method_name, args)
+                    with measure(cls_name, method_name, args):
+                        with guard(cls_name, method_name, args):
+                            result = method(*args)  # Invoke the method
+                        # Awaiting is bounded by the async timeout, not by the guard's signal timer
+                        if inspect.isawaitable(result):
+                            async_methods.add((cls_name, method_name))
+                            result = run_awaitable(result, async_timeout)
+                    if check_purity:
+                        purity.record(cls_name, method_name, state, fingerprint(instance), key)
+                    record_result(cls_name, method_name, args, result, return_type)
+            except (CallTimeout, Exception) as e:
+                record_error(cls_name, method_name, args, e)
+            finish_step(cls_name, progress, task)
+
+    async def run_sequence_async(cls_name, instance, progress, task):
+        current = sequence_number_of(cls_name)
+        while completed[cls_name] < sequence_number:
+            instance = next_instance(cls_name, instance, current)
+            current = sequence_number_of(cls_name)
+            method_name, args = None, None
+            try:
+                call = prepare_call(cls_name, instance)
+                if call is not None:
+                    method_name, method, args, return_type = call
+                    if contracts is not None:
+                        contracts.record_call(instance, method_name, args)
+                    with measure(cls_name, method_name, args):
+                        # Only the synchronous part is guarded: while awaiting, other tasks run
+                        with guard(cls_name, method_name, args):
+                            result = method(*args)
+                        if inspect.isawaitable(result):
+                            async_methods.add((cls_name, method_name))
+                            result = await await_with_timeout(result, async_timeout)
+                    record_result(cls_name, method_name, args, result, return_type)
+            except (CallTimeout, Exception) as e:
+                record_error(cls_name, method_name, args, e)
+            finish_step(cls_name, progress, task)
+
+    # Classes of other shards are not driven but still pooled as argument values
+    driven = [cls_name for cls_name, cls in class_map.items() if not shard or in_shard(cls, shard)]
+    if profiler is not None:
+        profiler.start()
+    try:
+        with Progress(console=console) as progress:
+            # Set up a progress bar for sequence generation
+            task = progress.add_task(
+                "[cyan]Generating sequences...",
+                total=sequence_number * len(driven),
+                completed=sum(completed[cls_name] for cls_name in driven),
+            )
+            # For each class, perform multiple method calls on the same instance
+            async_sequences = []
+            for cls_name in driven:
+                cls = class_map[cls_name]
+                if storage[cls_name] and completed[cls_name] < sequence_number:
+                    if cls_name not in instances:
+                        instances[cls_name] = random.choice(storage[cls_name])
+                    instance = instances[cls_name]
+                    print("\n-----> Using instance of", cls_name, ":", instance)
+                    if is_async_class(cls):
+                        # Sequences of coroutine classes are independent, so they run as concurrent tasks
+                        async_sequences.append(run_sequence_async(cls_name, instance, progress, task))
+                    else:
+                        run_sequence(cls_name, instance, progress, task)
+            if async_sequences:
+                # Time and peak memory are process-wide, so profiled sequences must not interleave
+                run_concurrently(async_sequences, sequential=profiler is not None)
+    except KeyboardInterrupt:
+        if checkpoint:
+            save_checkpoint(checkpoint, generator_state())
+            console.print(f"[bold yellow]Interrupted, progress saved to {checkpoint}[/bold yellow]")
+        raise
+    finally:
+        if profiler is not None:
+            profiler.stop()
+    if contracts is not None:
+        contracts.check(storage, error_buckets)  # Objects changed since the last batch
+    if checkpoint:
+        save_checkpoint(checkpoint, generator_state())
+    if strategy is not None and (strategy.mutated or strategy.timeouts):
+        print("Mutated", strategy.mutated, "argument lists;", strategy.timeouts, "calls exceeded the time budget")
+    if purity is not None and purity.skipped:
+        print("Skipped", purity.skipped, "repeated calls to pure methods:", purity.pure_methods())
     print("Class Map:", class_map)
     print("Storage Map:", storage)
-    return {"storage": storage, "sequences": sequences, "error_cases": error_prone_cases}
+    return {
+        "storage": storage,
+        "sequences": sequences,
+        "error_cases": error_buckets.cases(),
+        "error_buckets": error_buckets,
+        "async_methods": async_methods,
+    }
+
+def class_name(qualified_cls_name):
+    """
+    Returns the bare class name for a class key of the form "<class 'module.Name'>".
+    """
+    if qualified_cls_name.startswith("<class '"):
+        qualified_cls_name = qualified_cls_name[len("<class '"):-len("'>")]
+    return qualified_cls_name.rsplit(".", 1)[-1]
+
+
+def literal(value):
+    """
+    Renders a primitive as source code, spelling out non-finite floats and shortening
+    long strings of one repeated character.
+    """
+    if type(value) is float and not math.isfinite(value):
+        return f"float({str(value)!r})"
+    if type(value) is str and len(value) > 80 and value == value[0] * len(value):
+        return f"{value[0]!r} * {len(value)}"
+    return repr(value)
+
+
+def format_args(args):
+    """
+    Renders call arguments as source code: primitives as literals, objects as a
+    default construction of their class.
+    """
+    return ", ".join(
+        f"{literal(arg) if isinstance(arg, (int, float, str)) else f'{value_type_name(arg)}()'}"
+        for arg in args
+    )
+
+
+def group_sequences(sequences):
+    """
+    Splits the flat list of generated calls into test sequences. The generator drives
+    one instance per class, or a fresh one every `window` calls, so the calls of a class
+    on one instance form one sequence.
+    """
+    numbered = isinstance(sequences, SequenceStore)
+    tot_sequences = {}
+    for index, call in enumerate(sequences):
+        key = (call[0], sequences.sequence_of(index) if numbered else 0)
+        tot_sequences.setdefault(key, []).append(call)
+    return list(tot_sequences.values())
+
+
+# Helpers written into the head of a test file using the table layout. Each expected
+# result in a table is a literal, a class for an isinstance check, or one of the markers.
+TABLE_HEADER = '''UNCHECKED = object()  # Result varies between runs, not asserted
+NUMERIC = object()  # Compared with the snapshot, with a tolerance
+EXACT = object()  # Compared with the snapshot, exactly
+
+
+def _check(result, expected, numeric=None, other=None):
+    if expected is UNCHECKED:
+        return
+    if expected is NUMERIC:
+        numeric.append(result)
+    elif expected is EXACT:
+        other.append(result)
+    elif isinstance(expected, type):
+        assert isinstance(result, expected)
+    elif expected != expected:
+        assert result != result  # NaN
+    else:
+        assert result == expected
+
+'''
+
+
+def expected_result(result, action=None, use_snapshot=False):
+    """
+    Decides what a test asserts about a recorded result.
+
+    Args:
+        result: The result recorded at generation time.
+        action (str): "type" or "drop" for results found unstable by the flakiness check.
+        use_snapshot (bool): Whether results go to the snapshot file.
+
+    Returns:
+        tuple: ("drop", None), ("none", None), ("type", class name), ("numeric", value),
+               ("exact", value), ("nan", None) or ("value", source literal).
+    """
+    if action == "drop":
+        return "drop", None
+    if action == "type" and result is None:
+        return "none", None
+    if action != "type":
+        if use_snapshot and is_numeric(result):
+            return "numeric", result
+        if use_snapshot and is_exact(result):
+            return "exact", result
+        if type(result) is float and math.isnan(result):
+            return "nan", None
+        if isinstance(result, (int, float, str)):
+            return "value", literal(result)
+    return "type", value_type_name(result)
 
-def write_regression_tests(tot_sequences, module_name, file_path):
+
+def write_sequence_test(f, test_name, sequences, async_methods, expectations, snapshot_tests):
+    """
+    Writes one sequence as its own test function.
+    """
+    name = class_name(sequences[0][0])
+    is_async = any((cls_name, method_name) in async_methods for cls_name, method_name, _, _ in sequences)
+    indent = "        " if is_async else "    "
+    f.write(f"def {test_name}():\n")
+    if is_async:
+        f.write("    async def run_sequence():\n")
+    f.write(f"{indent}instance = {name}()\n")
+    if snapshot_tests is not None:
+        numeric, other = snapshot_tests[test_name] = ([], [])
+        f.write(f"{indent}numeric, other = [], []\n")
+    for (cls_name, method_name, args, result), (kind, expected) in zip(sequences, expectations):
+        call = f"instance.{method_name}({format_args(args)})"
+        if (cls_name, method_name) in async_methods:
+            call = f"await {call}"
+        f.write(f"{indent}result = {call}\n")
+
+        # Write assertions based on result types
+        if kind == "drop":
+            f.write("\n")
+        elif kind == "none":
+            f.write(f"{indent}assert result is None\n\n")
+        elif kind == "nan":
+            f.write(f"{indent}assert result != result  # NaN\n\n")
+        elif kind == "numeric":
+            numeric.append(expected)
+            f.write(f"{indent}numeric.append(result)\n\n")
+        elif kind == "exact":
+            other.append(expected)
+            f.write(f"{indent}other.append(result)\n\n")
+        elif kind == "value":
+            f.write(f"{indent}assert result == {expected}\n\n")
+        else:
+            f.write(f"{indent}assert isinstance(result, {expected})\n\n")
+    if snapshot_tests is not None:
+        f.write(f"{indent}check_snapshot({test_name!r}, numeric, other)\n\n")
+    if is_async:
+        f.write("    asyncio.run(run_sequence())\n\n")
+
+
+def write_table_test(f, test_name, rows, async_methods, snapshot_tests):
+    """
+    Writes sequences of the same shape (class and method-call pattern) as one test
+    parametrized over a table of arguments and expected results. Each row holds a
+    lambda that builds its arguments inside the test, so a constructor that raises
+    fails that row instead of the collection of the whole file.
+
+    Args:
+        f (file): Test file being written.
+        test_name (str): Name of the test function.
+        rows (list): (case name, sequence, expectations) triples sharing one shape.
+        async_methods (set): (class, method) pairs that are coroutines.
+        snapshot_tests (dict): Snapshot results by case name, or None for inline assertions.
+    """
+    markers = {"drop": "UNCHECKED", "numeric": "NUMERIC", "exact": "EXACT", "none": "None", "nan": "float('nan')"}
+    sequences = rows[0][1]
+    name = class_name(sequences[0][0])
+    is_async = any((cls_name, method_name) in async_methods for cls_name, method_name, _, _ in sequences)
+    indent = "        " if is_async else "    "
+    use_snapshot = snapshot_tests is not None
+
+    f.write(f"# {name}: {', '.join(method_name for _, method_name, _, _ in sequences)}\n")
+    f.write(f"@pytest.mark.parametrize({'name, make_args, expected' if use_snapshot else 'make_args, expected'!r}, [\n")
+    for case_name, case, expectations in rows:
+        args = ", ".join(f"({format_args(call_args)},)" if call_args else "()" for _, _, call_args, _ in case)
+        expected = ", ".join(markers.get(kind, value) for kind, value in expectations)
+        params = f"lambda: [{args}], [{expected}]"
+        if use_snapshot:
+            params = f"{case_name!r}, {params}"
+            snapshot_tests[case_name] = (
+                [value for kind, value in expectations if kind == "numeric"],
+                [value for kind, value in expectations if kind == "exact"],
+            )
+        f.write(f"    pytest.param({params}, id={case_name[len('test_'):]!r}),\n")
+    f.write("])\n")
+
+    f.write(f"def {test_name}({'name, make_args, expected' if use_snapshot else 'make_args, expected'}):\n")
+    if is_async:
+        f.write("    async def run_sequence():\n")
+    f.write(f"{indent}args = make_args()\n")
+    f.write(f"{indent}instance = {name}()\n")
+    if use_snapshot:
+        f.write(f"{indent}numeric, other = [], []\n")
+    for idx, (cls_name, method_name, _, _) in enumerate(sequences):
+        call = f"instance.{method_name}(*args[{idx}])"
+        if (cls_name, method_name) in async_methods:
+            call = f"await {call}"
+        f.write(f"{indent}result = {call}\n")
+        f.write(f"{indent}_check(result, expected[{idx}]{', numeric, other' if use_snapshot else ''})\n")
+    if use_snapshot:
+        f.write(f"{indent}check_snapshot(name, numeric, other)\n")
+    if is_async:
+        f.write("    asyncio.run(run_sequence())\n")
+    f.write("\n\n")
+
+
+def write_regression_tests(tot_sequences, module_name, file_path, async_methods=None, oracle="inline",
+                           rtol=1e-9, atol=1e-12, unstable=None, layout="functions"):
     """
     Writes generated test sequences to a regression test file.
 
     Args:
         tot_sequences (list): List of successful test sequences.
         module_name (str): Name of the module containing the classes.
-        file_path (Path): Path to the file with class definitions.
+        file_path (Path or list): Path to the file with class definitions, or a list of such paths.
+        async_methods (set): (class, method) pairs that are coroutines; sequences calling them
+                             are written as tests that await the calls on an event loop.
+        oracle (str): "inline" writes the expected results as assertions; "snapshot" stores them
+                      in a binary file next to the tests, compared in bulk with a tolerance.
+        rtol (float): Relative tolerance of numeric comparisons with the "snapshot" oracle.
+        atol (float): Absolute tolerance of numeric comparisons with the "snapshot" oracle.
+        unstable (dict): Sequence indices mapped to {call index: "type" | "drop"}, as found by
+                         the flakiness check; such calls get a type check or no assertion.
+        layout (str): "functions" writes one test function per sequence; "table" writes the
+                      sequences of each shape as one parametrized test over a data table.
+                      Tables only get several rows when the corpus holds short sequences
+                      of the same shape, as generated with a window.
     """
     test_file_name = "regression_tests.py"
-    file_stem = Path(file_path).stem  # Get the file name without extension
+    snapshot_name = "regression_tests.snap"
+    file_paths = [file_path] if isinstance(file_path, (str, Path)) else list(file_path)
+    async_methods = async_methods or set()
+    unstable = unstable or {}
+    use_snapshot = oracle == "snapshot"
+    snapshot_tests = {} if use_snapshot else None
 
     with open(test_file_name, "w") as f:
         # Write imports for the test file
+        if async_methods:
+            f.write("import asyncio\n")
         f.write("import pytest\n")
-        f.write(f"from {file_stem} import *\n\n")
+        if use_snapshot:
+            f.write(SNAPSHOT_HEADER.format(snapshot_name=snapshot_name))
+        for path in file_paths:
+            f.write(f"from {Path(path).stem} import *\n")  # Module names are the file names without extension
+        f.write("\n")
+        if layout == "table":
+            f.write("\n" + TABLE_HEADER + "\n")
 
-        # Generate test functions for each sequence
+        # Generate a test for each sequence, or for each shape of sequences
+        shapes = {}
         for id, sequences in enumerate(tot_sequences):
-            f.write(f"def test_{sequences[0][0]}_{sequences[0][1]}_{id}():\n")
-            f.write(f"    instance = {sequences[0][0]}()\n")
-            for idx, (cls_name, method_name, args, result) in enumerate(sequences):
-                args_str = ", ".join(
-                    f"{repr(arg) if isinstance(arg, (int, float, str)) else f'{arg.__class__.__name__}()'}"
-                    for arg in args
-                )
-                f.write(f"    result = instance.{method_name}({args_str})\n")
-
-                # Write assertions based on result types
-                if isinstance(result, (int, float, str)):
-                    f.write(f"    assert result == {repr(result)}\n\n")
-                else:
-                    f.write(f"    assert isinstance(result, {result.__class__.__name__})\n\n")
+            test_name = f"test_{class_name(sequences[0][0])}_{sequences[0][1]}_{id}"
+            expectations = [
+                expected_result(result, unstable.get(id, {}).get(idx), use_snapshot)
+                for idx, (_, _, _, result) in enumerate(sequences)
+            ]
+            if layout == "table":
+                shape = (sequences[0][0], tuple(method_name for _, method_name, _, _ in sequences))
+                shapes.setdefault(shape, []).append((test_name, sequences, expectations))
+            else:
+                write_sequence_test(f, test_name, sequences, async_methods, expectations, snapshot_tests)
+        for number, rows in enumerate(shapes.values()):
+            write_table_test(f, f"test_{class_name(rows[0][1][0][0])}_shape_{number}", rows, async_methods,
+                             snapshot_tests)
+    if use_snapshot:
+        write_snapshot(snapshot_name, snapshot_tests, rtol, atol)
+    from .coverage_analysis import print_coverage
+
     # Notify the user of the generated test file
     console.print(f"[bold green]Regression tests written to {test_file_name}[/bold green]")
-    print_coverage(test_file_name, file_path)
+    for path in file_paths:
+        print_coverage(test_file_name, path)
@@ -7,6 +7,7 @@ setup(
     entry_points={
         "console_scripts": [
             "randoop-cli = randoop_cli.cli:main",
+            "randoop-submit = randoop_cli.client:main",
         ]
     },
     install_requires=[],
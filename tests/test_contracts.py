@@ -0,0 +1,65 @@
+import time
+
+from randoop_cli.contracts import ContractChecker, check_eq_reflexive
+from randoop_cli.strategies import ValueStrategy
+
+
+class Money:
+    def __init__(self, amount=0):
+        self.amount = amount
+        self.poisoned = False
+
+    def bump(self, by):
+        self.amount += by
+
+    def poison(self):
+        self.poisoned = True
+
+    def hang(self):
+        while True:
+            pass
+
+    def __eq__(self, other):
+        return not self.poisoned and isinstance(other, Money) and other.amount == self.amount
+
+    __hash__ = object.__hash__
+
+
+def driven(checker, calls, amount=0):
+    obj = Money(amount)
+    checker.history[id(obj)] = (Money, [amount], [])
+    for method_name, args in calls:
+        getattr(obj, method_name)(*args)
+        checker.record_call(obj, method_name, args)
+    return obj
+
+
+def test_violation_is_minimized_to_the_calls_that_matter():
+    checker = ContractChecker()
+    obj = driven(checker, [("bump", [1]), ("bump", [2]), ("poison", []), ("bump", [3])])
+    assert checker.minimize([obj], check_eq_reflexive) == ["x = Money(0)", "x.poison()"]
+
+
+def test_long_histories_are_dropped():
+    checker = ContractChecker(max_history=3)
+    obj = driven(checker, [("bump", [1])] * 3 + [("poison", [])])
+    assert checker.history[id(obj)][2] is None
+    assert checker.minimize([obj], check_eq_reflexive) == ["x = <Money without recorded provenance>"]
+
+
+def test_minimization_stays_within_its_replay_budget():
+    checker = ContractChecker(max_replays=5)
+    obj = driven(checker, [("bump", [1])] * 40 + [("poison", [])])
+    lines = checker.minimize([obj], check_eq_reflexive)
+    assert checker.replays <= 5
+    assert lines[-1] == "x.poison()"
+
+
+def test_replayed_calls_run_under_the_time_budget():
+    strategy = ValueStrategy([], boundary_probability=0, mutation_probability=0, call_timeout=0.2)
+    checker = ContractChecker(strategy=strategy)
+    obj = driven(checker, [("poison", [])])
+    checker.history[id(obj)][2].append(("hang", []))
+    started = time.monotonic()
+    assert checker.rebuild(obj, checker.history[id(obj)][2]) is None
+    assert time.monotonic() - started < 5
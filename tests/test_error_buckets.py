@@ -0,0 +1,49 @@
+import traceback
+
+from randoop_cli.error_buckets import ErrorBuckets, raising_frame
+
+
+class Loud:
+    renders = 0
+
+    def __repr__(self):
+        Loud.renders += 1
+        return "Loud()"
+
+
+def withdraw(amount):
+    if amount > 10:
+        raise ValueError(f"Insufficient balance for {amount}")
+
+
+def failure(amount):
+    try:
+        withdraw(amount)
+    except ValueError as e:
+        return e
+
+
+def test_raising_frame_is_the_innermost_frame():
+    exception = failure(50)
+    frame = traceback.extract_tb(exception.__traceback__)[-1]
+    assert raising_frame(exception) == ("test_error_buckets.py", frame.lineno, "withdraw")
+    assert raising_frame(ValueError("never raised")) is None
+
+
+def test_duplicates_keep_the_smallest_input():
+    buckets = ErrorBuckets()
+    assert buckets.add("Account", "withdraw", [12345], failure(12345))
+    assert not buckets.add("Account", "withdraw", [50], failure(50))
+    assert len(buckets) == 1
+    ((count, case),) = buckets.summary()
+    assert count == 2 and case[2] == [50]
+
+
+def test_inputs_with_more_arguments_are_not_rendered():
+    buckets = ErrorBuckets()
+    buckets.add("Account", "withdraw", [50], failure(50))
+    renders = Loud.renders
+    for _ in range(3):
+        buckets.add("Account", "withdraw", [50, Loud()], failure(50))
+    assert Loud.renders == renders
+    assert buckets.cases()[0][2] == [50]
@@ -0,0 +1,28 @@
+import pytest
+
+from randoop_cli.flakiness import verify_sequences
+
+COUNTER = '''class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def bump(self, by: int) -> int:
+        self.count += by
+        return self.count
+'''
+
+SEQUENCE = [("<class 'Counter.Counter'>", "bump", [2], 2), ("<class 'Counter.Counter'>", "bump", [3], 5)]
+
+
+def test_stable_sequence_keeps_its_assertions(tmp_path):
+    target = tmp_path / "Counter.py"
+    target.write_text(COUNTER)
+    report = verify_sequences([SEQUENCE], [target], runs=2, workers=2)
+    assert report == {"unstable": {}, "flaky": [], "stale": [], "failing": []}
+
+
+def test_worker_that_cannot_load_the_targets_fails_verification(tmp_path):
+    target = tmp_path / "Counter.py"
+    target.write_text("import definitely_missing_module\n" + COUNTER)
+    with pytest.raises(RuntimeError, match="definitely_missing_module"):
+        verify_sequences([SEQUENCE], [target], runs=2, workers=2)
@@ -0,0 +1,66 @@
+from randoop_cli.purity import PurityOracle, analyze_purity
+
+TOTAL = 0
+
+
+class Cart:
+    def __init__(self):
+        self.items = []
+        self.owner = None
+
+    def size(self):
+        return len(self.items)
+
+    def rename(self, owner):
+        self.owner = owner
+
+    def add(self, item):
+        self.items.append(item)
+
+    def tag(self, name, value):
+        setattr(self, name, value)
+
+    def count_globally(self):
+        global TOTAL
+        TOTAL += 1
+        return TOTAL
+
+    def checkout(self):
+        self.clear()
+        return self.size()
+
+    def clear(self):
+        self.items = []
+
+    def local_copy(self):
+        items = list(self.items)
+        items.append(None)
+        return items
+
+
+def test_classifier_flags_writes_to_the_receiver():
+    purity = analyze_purity(Cart)
+    assert purity["size"] and purity["local_copy"]
+    assert not purity["rename"]  # self.x = ...
+    assert not purity["add"]  # self.items.append(...)
+    assert not purity["tag"]  # setattr(self, ...)
+    assert not purity["count_globally"]  # global
+
+
+def test_impurity_propagates_through_calls_on_self():
+    purity = analyze_purity(Cart)
+    assert not purity["clear"]
+    assert not purity["checkout"]
+
+
+def test_seen_calls_are_bounded():
+    oracle = PurityOracle([("Cart", Cart)], max_calls=2)
+    cart = Cart()
+    keys = [oracle.call_key(str(Cart), "size", b"state", [index]) for index in range(3)]
+    for key in keys:
+        oracle.record(str(Cart), "size", b"state", b"state", key)
+    assert len(oracle.seen) == 2
+    assert not oracle.seen_before(keys[0])
+    assert oracle.seen_before(keys[1]) and oracle.seen_before(keys[2])
+    oracle.record(str(Cart), "rename", b"state", b"changed", oracle.call_key(str(Cart), "rename", b"state", [cart]))
+    assert (str(Cart), "rename") in oracle.demoted
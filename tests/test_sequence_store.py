@@ -0,0 +1,85 @@
+import math
+import pickle
+
+from randoop_cli.sequence_store import CapturedValue, SequenceStore
+
+
+class Account:
+    def __init__(self, balance=0):
+        self.balance = balance
+
+    def __eq__(self, other):
+        return isinstance(other, Account) and other.balance == self.balance
+
+
+class Opaque:
+    def __repr__(self):
+        return "Opaque(7)"
+
+
+CLS = str(Account)
+
+PRIMITIVES = [
+    None, True, False, 0, -1, 2 ** 63 - 1, -2 ** 63, 2 ** 63, -2 ** 200, 10 ** 40 + 1,
+    0.0, -0.0, 1.5, math.inf, -math.inf, "", "é", "\ud800", "a\x00b" * 1000,
+]
+
+
+def roundtrip(store):
+    return pickle.loads(pickle.dumps(store, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def test_primitives_round_trip():
+    store = SequenceStore()
+    for value in PRIMITIVES:
+        store.append((CLS, "deposit", [value], value))
+    for value, (cls_name, method_name, args, result) in zip(PRIMITIVES, store):
+        assert (cls_name, method_name) == (CLS, "deposit")
+        assert type(args[0]) is type(value) and args[0] == value and result == value
+    assert math.copysign(1.0, store[11][3]) == -1.0  # -0.0 keeps its sign
+
+
+def test_nan_round_trips():
+    store = SequenceStore()
+    store.append((CLS, "deposit", [math.nan], math.nan))
+    _, _, args, result = store[0]
+    assert math.isnan(args[0]) and math.isnan(result)
+
+
+def test_pooled_and_captured_values():
+    pooled = Account(5)
+    store = SequenceStore({CLS: [Account(1), pooled]})
+    store.append((CLS, "transfer", [pooled, Opaque()], pooled))
+    _, _, args, result = store[0]
+    assert args[0] is pooled and result is pooled
+    assert args[1] == CapturedValue("Opaque", "Opaque(7)")
+    assert repr(args[1]) == "Opaque(7)"
+
+
+def test_reads_across_the_spill_boundary():
+    store = SequenceStore(memory_budget=256)
+    calls = [(CLS, "deposit", [index, "x" * (index % 50)], index * 2) for index in range(500)]
+    calls.append((CLS, "deposit", [], None))
+    store.extend(calls)
+    assert store.spilled and store.buffer
+    assert list(store) == calls
+    assert store[-1] == calls[-1] and store[10:13] == calls[10:13]
+
+
+def test_pickled_store_is_self_contained():
+    pools = {CLS: [Account(3)]}
+    store = SequenceStore(pools, memory_budget=512)
+    calls = [(CLS, "deposit", [index, 2 ** 70 + index, "\ud800"], pools[CLS][0]) for index in range(200)]
+    store.extend(calls)
+    for index in range(3):
+        store.append((CLS, "deposit", [index], None), sequence=index + 1)
+    assert store.spilled
+
+    copy = roundtrip(store)
+    assert len(copy) == len(store)
+    assert copy.spilled  # A loaded store spills again instead of holding everything in memory
+    assert [call[:3] for call in copy] == [call[:3] for call in store]
+    assert copy[0][3] == Account(3)
+    assert [copy.sequence_of(index) for index in range(len(copy))] == [0] * 200 + [1, 2, 3]
+    copy.append((CLS, "deposit", [1], 1))
+    assert copy[-1] == (CLS, "deposit", [1], 1)
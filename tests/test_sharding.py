@@ -0,0 +1,34 @@
+import sys
+
+from rich.console import Console
+
+from randoop_cli.error_buckets import ErrorBuckets
+from randoop_cli.sharding import load_shard_results, merge_shard_results, write_shard_result
+
+SOURCES = {"ShardCounter": '''class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def bump(self, by: int) -> int:
+        self.count += by
+        return self.count
+'''}
+
+CLS = "<class 'ShardCounter.Counter'>"
+
+
+def merged_result(sequences):
+    return {"sequences": sequences, "error_buckets": ErrorBuckets(), "async_methods": set()}
+
+
+def test_merged_sequences_of_one_class_stay_separate(tmp_path):
+    first = [(CLS, "bump", [1], 1), (CLS, "bump", [2], 3)]
+    second = [(CLS, "bump", [5], 5)]
+    path = tmp_path / "merged.pkl"
+    write_shard_result(path, None, SOURCES, merged_result([first, second]), {})
+    try:
+        results = load_shard_results([path, path], Console(quiet=True))
+        merged = merge_shard_results(results)
+    finally:
+        sys.modules.pop("ShardCounter", None)
+    assert merged["sequences"] == [first, second]
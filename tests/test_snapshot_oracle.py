@@ -0,0 +1,41 @@
+import pickle
+import sys
+
+from randoop_cli.test_generator import expected_result, write_regression_tests
+
+GAUGE = '''class Gauge:
+    def __init__(self):
+        self.level = 0.0
+
+    def fill(self, by: float) -> float:
+        self.level += by
+        return self.level
+
+    def ticks(self) -> int:
+        return 2 ** 40 + 1
+'''
+
+CLS = "<class 'Gauge.Gauge'>"
+
+
+def test_ints_are_compared_exactly():
+    assert expected_result(2 ** 40 + 1, use_snapshot=True) == ("exact", 2 ** 40 + 1)
+    assert expected_result(True, use_snapshot=True) == ("exact", True)
+    assert expected_result(0.5, use_snapshot=True) == ("numeric", 0.5)
+
+
+def test_snapshot_stores_both_tolerances(tmp_path, monkeypatch):
+    (tmp_path / "Gauge.py").write_text(GAUGE)
+    monkeypatch.chdir(tmp_path)
+    sequences = [[(CLS, "fill", [0.5], 0.5), (CLS, "ticks", [], 2 ** 40 + 1)]]
+    try:
+        write_regression_tests(sequences, None, [tmp_path / "Gauge.py"], oracle="snapshot", rtol=1e-6, atol=1e-3)
+    finally:
+        sys.modules.pop("Gauge", None)
+        sys.modules.pop("regression_tests", None)
+
+    with open(tmp_path / "regression_tests.snap", "rb") as f:
+        snapshot = pickle.load(f)
+    assert (snapshot["rtol"], snapshot["atol"]) == (1e-6, 1e-3)
+    (test,) = snapshot["tests"].values()
+    assert test["count"] == 1 and test["other"] == [2 ** 40 + 1]
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Budget for `import randoop_cli.cli` in milliseconds (best of RUNS), before any command runs
+BUDGET_MS = float(os.environ.get("RANDOOP_IMPORT_BUDGET_MS", 150))
+RUNS = 3
+
+# Modules only some subcommands need, which must be imported lazily
+LAZY_MODULES = ["requests", "coverage", "randoop_cli.test_generator"]
+
+
+def import_times(module="randoop_cli.cli"):
+    """
+    Imports a module in a fresh interpreter under `-X importtime`.
+
+    Returns:
+        dict: Cumulative import time in microseconds of every module that was imported.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_stays_within_budget():
+    best = min(import_times()["randoop_cli.cli"] for _ in range(RUNS)) / 1000
+    assert best <= BUDGET_MS, f"import randoop_cli.cli took {best:.1f} ms, budget is {BUDGET_MS:.0f} ms"
+
+
+def test_cli_import_defers_heavy_modules():
+    imported = import_times()
+    assert [module for module in LAZY_MODULES if module in imported] == []
+
+
+def test_submit_client_does_not_import_the_cli():
+    imported = import_times("randoop_cli.client")
+    assert [module for module in ["randoop_cli.cli", "click", "rich"] if module in imported] == []
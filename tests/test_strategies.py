@@ -0,0 +1,35 @@
+import time
+
+import pytest
+
+from randoop_cli.strategies import CallTimeout, ValueStrategy
+
+
+def swallows_exceptions():
+    while True:
+        try:
+            time.sleep(0.01)
+        except Exception:
+            pass
+
+
+def swallows_the_first_timeout():
+    try:
+        while True:
+            pass
+    except BaseException:
+        pass
+    while True:
+        pass
+
+
+@pytest.mark.parametrize("call", [swallows_exceptions, swallows_the_first_timeout])
+def test_timeout_interrupts_code_that_catches_it(call):
+    strategy = ValueStrategy([], boundary_probability=0, mutation_probability=0, call_timeout=0.2)
+    started = time.monotonic()
+    with pytest.raises(CallTimeout):
+        with strategy.guard("Target", call.__name__, []):
+            call()
+    assert time.monotonic() - started < 5
+    assert strategy.timeouts == 1
+    time.sleep(0.2)  # The timer is disarmed once the guard exits
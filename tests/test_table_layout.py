@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+from randoop_cli.sequence_store import SequenceStore
+from randoop_cli.test_generator import group_sequences, write_regression_tests
+
+COUNTER = '''class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def bump(self, by: int) -> int:
+        self.count += by
+        return self.count
+
+    def reset(self) -> int:
+        self.count = 0
+        return self.count
+'''
+
+CLS = "<class 'Counter.Counter'>"
+
+
+def test_windows_of_a_class_are_separate_sequences():
+    store = SequenceStore()
+    for sequence, by in enumerate([1, 2, 3]):
+        store.append((CLS, "bump", [by], by), sequence)
+        store.append((CLS, "reset", [], 0), sequence)
+    assert [[call[2] for call in sequence] for sequence in group_sequences(store)] == [
+        [[1], []], [[2], []], [[3], []],
+    ]
+
+
+def test_sequences_of_one_shape_share_a_parametrized_test(tmp_path, monkeypatch):
+    (tmp_path / "Counter.py").write_text(COUNTER)
+    monkeypatch.chdir(tmp_path)
+    sequences = [[(CLS, "bump", [by], by), (CLS, "reset", [], 0)] for by in range(5)]
+    sequences.append([(CLS, "reset", [], 0)])
+    write_regression_tests(sequences, None, [tmp_path / "Counter.py"], layout="table")
+
+    source = (tmp_path / "regression_tests.py").read_text()
+    assert source.count("@pytest.mark.parametrize") == 2
+    assert source.count("pytest.param(") == 6
+    completed = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "regression_tests.py"],
+                               cwd=tmp_path, capture_output=True, text=True)
+    assert "6 passed" in completed.stdout, completed.stdout